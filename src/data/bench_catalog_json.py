@@ -0,0 +1,1106 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for generate_catalog_json.py.
+
+Usage:
+  python src/data/bench_catalog_json.py ingest
+  python src/data/bench_catalog_json.py url-cache
+  python src/data/bench_catalog_json.py url-throughput
+  python src/data/bench_catalog_json.py url-throttle
+  python src/data/bench_catalog_json.py url-deadline
+  python src/data/bench_catalog_json.py pipeline
+  python src/data/bench_catalog_json.py specs
+  python src/data/bench_catalog_json.py compact
+  python src/data/bench_catalog_json.py search-index
+  python src/data/bench_catalog_json.py diff
+  python src/data/bench_catalog_json.py synthetic
+  python src/data/bench_catalog_json.py stream-groups
+  python src/data/bench_catalog_json.py records
+  python src/data/bench_catalog_json.py ingest --xlsx "src/data/ΚΑΤΑΣΤΑΣΗ ΕΙΔΩΝ ΚΑΙ ΠΕΡΙΓΡΑΦΕΣ SITE.xlsx" --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator
+from unittest.mock import patch
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import catalog_compact  # noqa: E402
+import catalog_diff  # noqa: E402
+import catalog_search  # noqa: E402
+import catalog_specs  # noqa: E402
+import generate_catalog_json as gen  # noqa: E402
+from catalog_records import CatalogRow  # noqa: E402
+from catalog_xlsx_reader import iter_xlsx_records  # noqa: E402
+
+
+DEFAULT_XLSX = Path(__file__).resolve().parent / "ΚΑΤΑΣΤΑΣΗ ΕΙΔΩΝ ΚΑΙ ΠΕΡΙΓΡΑΦΕΣ SITE.xlsx"
+DEFAULT_OLD_XLSX = Path(__file__).resolve().parent / "ΚΑΤΑΣΤΑΣΗ ΕΙΔΩΝ ΚΑΙ ΠΕΡΙΓΡΑΦΕΣ SITE_old.xlsx"
+DEFAULT_PRODUCTS_JSON = Path(__file__).resolve().parent / "products-grouped.json"
+SPECS_GOLDEN = Path(__file__).resolve().parent / "specs-golden.json"
+SYNTHETIC_BASELINES = Path(__file__).resolve().parent / "bench-baselines.json"
+# The repository's .cache, wherever the bench is run from.
+SYNTHETIC_CACHE = Path(__file__).resolve().parents[2] / ".cache" / "bench-workbooks"
+# Bump when the synthetic layout changes so cached workbooks are rewritten.
+SYNTHETIC_LAYOUT_VERSION = 2
+SYNTHETIC_COLORS = (
+    "ΛΕΥΚΟ", "ΜΑΥΡΟ", "ΓΚΡΙ", "ΚΟΚΚΙΝΟ", "ΜΠΛΕ", "ΠΡΑΣΙΝΟ", "ΚΡΕΜ", "ΡΟΖ ΣΚΟΥΡΟ", "ΤΙΤΑΝΙΟ", "ΜΩΒ",
+)
+SYNTHETIC_CATEGORIES = ("ΕΙΔΗ ΣΠΙΤΙΟΥ", "ΓΛΑΣΤΡΕΣ", "ΕΠΑΓΓΕΛΜΑΤΙΚΟΣ ΕΞΟΠΛΙΣΜΟΣ")
+INGEST_MODES = {
+    # mode: (engine, streaming)
+    "full": ("openpyxl", False),
+    "streaming": ("openpyxl", True),
+    "xml": ("xml", False),
+}
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
+
+
+def run_ingest_worker(xlsx_path: Path, mode: str) -> dict[str, Any]:
+    started = time.perf_counter()
+    engine, streaming = INGEST_MODES[mode]
+    rows = gen.read_rows(xlsx_path, None, engine=engine, streaming=streaming)
+    return {
+        "mode": mode,
+        "rows": len(rows),
+        "seconds": time.perf_counter() - started,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_in_subprocess(*worker_args: str) -> dict[str, Any]:
+    # Each measurement runs in a fresh interpreter so peak RSS is not shared
+    # between modes.
+    completed = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), *worker_args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def bench_ingest(args: argparse.Namespace) -> None:
+    print(f"Workbook: {args.xlsx} ({args.xlsx.stat().st_size / 1024 / 1024:.1f} MB)")
+    print(f"{'mode':<12}{'rows':>8}{'best s':>10}{'peak RSS MB':>14}")
+    for mode in INGEST_MODES:
+        results = [
+            run_in_subprocess("ingest-worker", "--mode", mode, "--xlsx", str(args.xlsx))
+            for _ in range(args.repeat)
+        ]
+        best = min(result["seconds"] for result in results)
+        peak = max(result["peak_rss_mb"] for result in results)
+        print(f"{mode:<12}{results[0]['rows']:>8}{best:>10.2f}{peak:>14.1f}")
+
+
+class StandInImageHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the image host.
+
+    ``/images/<name>`` exists (with a stable ETag), ``/status/<code>`` answers
+    with that status, anything else is a 404.
+    The server's ``latency`` attribute adds a delay to every response; with
+    ``max_in_flight`` set, requests beyond that many concurrent ones get a 429
+    with ``Retry-After: 1``.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        # One handler instance per TCP connection.
+        super().setup()
+        self.server.connections += 1
+
+    def do_HEAD(self) -> None:
+        self.respond(send_body=False)
+
+    def do_GET(self) -> None:
+        self.respond(send_body=True)
+
+    def respond(self, send_body: bool) -> None:
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.in_flight += 1
+            throttled = bool(self.server.max_in_flight) and self.server.in_flight > self.server.max_in_flight
+        try:
+            time.sleep(self.server.latency)
+            self.respond_to_path(send_body, throttled)
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def respond_to_path(self, send_body: bool, throttled: bool) -> None:
+        if throttled:
+            self.server.throttled += 1
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.path.startswith("/status/"):
+            self.send_response(int(self.path.removeprefix("/status/")))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if not self.path.startswith("/images/"):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        etag = f'"{abs(hash(self.path)) & 0xFFFFFFFF:x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        body = b"image"
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under concurrent connects, which
+    # turns into 1 s retransmits and swamps the measurements.
+    request_queue_size = 256
+
+
+@contextmanager
+def stand_in_server(latency: float = 0.0, max_in_flight: int = 0) -> Iterator[ThreadingHTTPServer]:
+    server = StandInServer(("127.0.0.1", 0), StandInImageHandler)
+    server.latency = latency
+    server.max_in_flight = max_in_flight
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.throttled = 0
+    server.connections = 0
+    server.requests = 0
+    server.not_modified = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def stand_in_mapping(base_url: str, codes: int, missing_every: int = 10) -> dict[str, list[str]]:
+    mapping: dict[str, list[str]] = {}
+    for index in range(codes):
+        folder = "missing" if missing_every and index % missing_every == 0 else "images"
+        mapping[f"CODE-{index:05d}"] = [
+            f"{base_url}/{folder}/{index}-a.jpg",
+            f"{base_url}/images/{index}-b.jpg",
+        ]
+    return mapping
+
+
+def bench_url_cache(args: argparse.Namespace) -> None:
+    with stand_in_server() as server, tempfile.TemporaryDirectory() as tmp:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        mapping = stand_in_mapping(base_url, args.codes)
+        cache_path = Path(tmp) / "url-status.sqlite3"
+
+        print(f"{'run':<14}{'seconds':>9}{'requests':>10}{'304s':>6}{'fresh':>7}{'removed':>9}")
+        # cold: nothing cached; revalidate: TTL expired, conditional requests;
+        # warm: everything within TTL, no network at all.
+        for label, ttl_seconds in (("cold", 3600.0), ("revalidate", 0.0), ("warm", 3600.0)):
+            requests_before, not_modified_before = server.requests, server.not_modified
+            url_cache = gen.UrlStatusCache(cache_path, ttl_seconds=ttl_seconds)
+            stats: Counter[str] = Counter()
+            started = time.perf_counter()
+            _, _, removed = gen.filter_unreachable_additional_images(
+                mapping,
+                timeout_seconds=5.0,
+                workers=args.workers,
+                url_cache=url_cache,
+                stats=stats,
+            )
+            elapsed = time.perf_counter() - started
+            url_cache.close()
+            print(
+                f"{label:<14}{elapsed:>9.2f}{server.requests - requests_before:>10}"
+                f"{server.not_modified - not_modified_before:>6}{stats['fresh']:>7}{removed:>9}"
+            )
+
+
+def bench_url_throughput(args: argparse.Namespace) -> None:
+    with stand_in_server(latency=args.latency) as server:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = sorted({url for urls in stand_in_mapping(base_url, args.urls // 2).values() for url in urls})
+        print(f"{len(urls)} URLs, {args.latency * 1000:.0f} ms injected latency, {args.workers} workers")
+        print(f"{'backend':<10}{'seconds':>9}{'URLs/s':>9}{'connections':>13}")
+
+        reference = None
+        for backend in gen.URL_BACKENDS:
+            connections_before = server.connections
+            started = time.perf_counter()
+            reachable = gen.check_urls(
+                urls,
+                timeout_seconds=10.0,
+                workers=args.workers,
+                backend=backend,
+                per_host=args.per_host,
+            )
+            elapsed = time.perf_counter() - started
+            if reference is not None and reachable != reference:
+                raise SystemExit(f"{backend} disagrees with {gen.URL_BACKENDS[0]} on reachability")
+            reference = reachable
+            print(
+                f"{backend:<10}{elapsed:>9.2f}{len(urls) / elapsed:>9.0f}"
+                f"{server.connections - connections_before:>13}"
+            )
+
+
+def bench_url_throttle(args: argparse.Namespace) -> None:
+    with stand_in_server(latency=args.latency, max_in_flight=args.max_in_flight) as server:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        mapping = stand_in_mapping(base_url, args.codes)
+        urls = {url for urls in mapping.values() for url in urls}
+        missing = sum(1 for url in urls if "/missing/" in url)
+        print(
+            f"{len(urls)} URLs ({missing} missing), host allows {args.max_in_flight} "
+            f"concurrent requests, {args.workers} workers"
+        )
+        print(f"{'backend':<10}{'seconds':>9}{'429s':>7}{'removed':>9}{'unverified':>12}{'concurrency':>13}")
+
+        for backend in gen.URL_BACKENDS:
+            throttled_before = server.throttled
+            stats: Counter[str] = Counter()
+            started = time.perf_counter()
+            _, _, removed = gen.filter_unreachable_additional_images(
+                mapping,
+                timeout_seconds=10.0,
+                workers=args.workers,
+                backend=backend,
+                per_host=args.workers,
+                stats=stats,
+            )
+            elapsed = time.perf_counter() - started
+            concurrency = (
+                f"{stats['concurrency_min']}-{stats['concurrency_max']}" if backend == "asyncio" else "fixed"
+            )
+            print(
+                f"{backend:<10}{elapsed:>9.2f}{server.throttled - throttled_before:>7}"
+                f"{removed:>9}{stats['unverified']:>12}{concurrency:>13}"
+            )
+
+
+def bench_url_deadline(args: argparse.Namespace) -> None:
+    with stand_in_server(latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        mapping = stand_in_mapping(base_url, args.codes)
+        codes = sorted(mapping)
+        known = {code: mapping[code] for code in codes[: len(codes) // 2]}
+        known_urls = {url for urls in known.values() for url in urls}
+        print(
+            f"{sum(len(urls) for urls in mapping.values())} URLs ({len(known_urls)} validated in an "
+            f"earlier run, cache expired), {args.latency * 1000:.0f} ms latency, {args.deadline:.1f} s deadline"
+        )
+        print(f"{'backend':<10}{'seconds':>9}{'validated':>11}{'new first':>11}{'unreached':>11}{'removed':>9}")
+
+        for backend in gen.URL_BACKENDS:
+            cache_path = Path(tmp) / f"{backend}.sqlite3"
+            url_cache = gen.UrlStatusCache(cache_path, ttl_seconds=0.0)
+            gen.filter_unreachable_additional_images(
+                known, 10.0, args.workers, url_cache=url_cache, backend=backend, per_host=args.workers
+            )
+            url_cache.close()
+
+            url_cache = gen.UrlStatusCache(cache_path, ttl_seconds=0.0)
+            requests_before = server.requests
+            stats: Counter[str] = Counter()
+            started = time.perf_counter()
+            _, _, removed = gen.filter_unreachable_additional_images(
+                mapping,
+                timeout_seconds=10.0,
+                workers=args.workers,
+                url_cache=url_cache,
+                backend=backend,
+                per_host=args.workers,
+                stats=stats,
+                deadline_seconds=args.deadline,
+            )
+            elapsed = time.perf_counter() - started
+            url_cache.close()
+            new_urls = len({url for urls in mapping.values() for url in urls} - known_urls)
+            new_validated = min(new_urls, server.requests - requests_before)
+            print(
+                f"{backend:<10}{elapsed:>9.2f}{stats['probed']:>11}{f'{new_validated}/{new_urls}':>11}"
+                f"{stats['unreached']:>11}{removed:>9}"
+            )
+
+
+def run_build_on_host(
+    xlsx_path: Path,
+    base_url: str,
+    out_dir: Path,
+    check_args: list[str],
+    changed_group: str | None = None,
+) -> tuple[float, int, str]:
+    """One build_catalog run with image URLs on the stand-in host; (seconds, URLs probed, outputs).
+
+    With ``changed_group``, that group's rows get a new title so only it is
+    rebuilt against the build cache of the previous run in ``out_dir``.
+    """
+    read_rows = gen.iter_source_rows
+
+    def rows_on_host(*args: Any, **kwargs: Any) -> Iterator[CatalogRow]:
+        for row in read_rows(*args, **kwargs):
+            row.variant.image_url = row.variant.image_url.replace("https://viomes.gr", base_url)
+            row.additional_images = [url.replace("https://viomes.gr", base_url) for url in row.additional_images]
+            if row.group_root == changed_group:
+                row.title += " (new)"
+            yield row
+
+    products_path = out_dir / "products-grouped.json"
+    additional_path = out_dir / "additional-images.json"
+    argv = [
+        "generate_catalog_json.py",
+        "--xlsx", str(xlsx_path),
+        "--engine", "xml",
+        "--no-url-cache",
+        "--build-cache", str(out_dir / "catalog-build.json"),
+        "--products-out", str(products_path),
+        "--additional-out", str(additional_path),
+        *check_args,
+    ]
+    if changed_group is None:
+        argv.append("--force")
+    else:
+        # The workbook file is unchanged, so drop an output to get past the
+        # up-to-date check and down to the per-group cache.
+        products_path.unlink()
+    summary = io.StringIO()
+    started = time.perf_counter()
+    with patch.object(gen, "iter_source_rows", rows_on_host), patch.object(sys, "argv", argv):
+        with redirect_stdout(summary):
+            gen.build_catalog(gen.parse_args())
+    elapsed = time.perf_counter() - started
+    probed = int(summary.getvalue().split("URL checks: ", 1)[1].split(" ", 1)[0])
+    outputs = products_path.read_text(encoding="utf-8") + additional_path.read_text(encoding="utf-8")
+    return elapsed, probed, outputs
+
+
+def bench_pipeline(args: argparse.Namespace) -> None:
+    changed_group = next(gen.iter_source_rows(args.xlsx, None, engine="xml", streaming=False)).group_root
+    with stand_in_server(latency=args.latency) as server:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        check_args = [
+            "--url-backend", args.backend,
+            "--url-workers", str(args.workers),
+            "--url-per-host", str(args.workers),
+        ]
+        print(f"Workbook: {args.xlsx.name}, {args.latency * 1000:.0f} ms latency, {args.backend} backend")
+        print(f"{'build':<16}{'mode':<12}{'total s':>9}{'URLs':>7}")
+
+        outputs: dict[str, set[str]] = {"every group": set(), "one group": set()}
+        for mode in ("sequential", "pipelined"):
+            mode_args = [*check_args, "--pipeline"] if mode == "pipelined" else check_args
+            with tempfile.TemporaryDirectory() as tmp:
+                for build, group in (("every group", None), ("one group", changed_group)):
+                    elapsed, probed, output = run_build_on_host(args.xlsx, base_url, Path(tmp), mode_args, group)
+                    outputs[build].add(output)
+                    print(f"{build:<16}{mode:<12}{elapsed:>9.2f}{probed:>7}")
+
+        if any(len(texts) != 1 for texts in outputs.values()):
+            raise SystemExit("pipelined output differs from sequential output")
+        print("Outputs identical")
+
+
+def workbook_descriptions(xlsx_path: Path) -> list[str]:
+    """Every description in the sheet (green or not), in sheet order."""
+    records = iter_xlsx_records(
+        xlsx_path, None, (gen.COL_DESCRIPTION,), gen.COL_DESCRIPTION, gen.GREEN_FILL_HEX_SUFFIX
+    )
+    return [gen.clean(description) for description, _ in records]
+
+
+def write_specs_golden(descriptions: list[str]) -> None:
+    lines = [
+        f"  {json.dumps(description, ensure_ascii=False)}: "
+        f"{json.dumps(list(catalog_specs.parse_normalized_specs(catalog_specs.normalize_description(description))))}"
+        for description in sorted(set(descriptions))
+    ]
+    SPECS_GOLDEN.write_text("{\n" + ",\n".join(lines) + "\n}\n", encoding="utf-8")
+
+
+def best_of(repeat: int, run: Any, setup: Any = None) -> float:
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def bench_specs(args: argparse.Namespace) -> None:
+    descriptions = workbook_descriptions(args.xlsx)
+    if args.update_golden:
+        write_specs_golden(descriptions)
+        print(f"Wrote {SPECS_GOLDEN} ({len(set(descriptions))} descriptions)")
+        return
+
+    golden = json.loads(SPECS_GOLDEN.read_text(encoding="utf-8"))
+    mismatches = [
+        description
+        for description, expected in golden.items()
+        if catalog_specs.parse_specs_from_text(description)
+        != {**dict(zip(catalog_specs.SPEC_FIELDS, expected)), "has_specs": any(expected)}
+    ]
+    missing = {description for description in descriptions if description not in golden}
+    print(f"Golden corpus: {len(golden)} descriptions, {len(mismatches)} mismatches, {len(missing)} not in corpus")
+    for description in mismatches[:10]:
+        print(f"  mismatch: {description!r}")
+    if mismatches:
+        raise SystemExit("spec parsing differs from the golden corpus")
+
+    # The generator used to parse each variant's description once to find the
+    # specs source and again for the chosen one, recompiling patterns inline.
+    uncached = catalog_specs.parse_normalized_specs.__wrapped__
+
+    def per_call() -> None:
+        for description in descriptions:
+            for _ in range(2):
+                catalog_specs.specs_dict(uncached(catalog_specs.normalize_description(description)))
+
+    def memoized() -> None:
+        for description in descriptions:
+            catalog_specs.parse_specs_from_text(description)
+
+    clear_cache = catalog_specs.parse_normalized_specs.cache_clear
+    per_call_seconds = best_of(args.repeat, per_call, setup=clear_cache)
+    memoized_seconds = best_of(args.repeat, memoized, setup=clear_cache)
+    warm_seconds = best_of(args.repeat, memoized)
+    print(f"{len(descriptions)} descriptions ({len(set(descriptions))} distinct), best of {args.repeat}")
+    print(f"{'mode':<26}{'ms':>9}{'speedup':>9}")
+    for mode, seconds in (
+        ("uncached, 2 calls/row", per_call_seconds),
+        ("memoized, cold cache", memoized_seconds),
+        ("memoized, warm cache", warm_seconds),
+    ):
+        print(f"{mode:<26}{seconds * 1000:>9.2f}{per_call_seconds / seconds:>8.1f}x")
+
+
+def bench_compact(args: argparse.Namespace) -> None:
+    pretty = args.products.read_text(encoding="utf-8")
+    payload = json.loads(pretty)
+    minified = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    compact = json.dumps(catalog_compact.encode_catalog(payload), ensure_ascii=False, separators=(",", ":"))
+    if catalog_compact.decode_catalog(json.loads(compact)) != payload:
+        raise SystemExit("compact catalog does not decode back to the original payload")
+
+    print(f"Catalog: {args.products} ({payload['products_count']} products), best of {args.repeat}")
+    print(f"{'format':<12}{'KB':>9}{'gzip KB':>9}{'parse ms':>10}{'decode ms':>11}")
+    for name, text, decode in (
+        ("indent=2", pretty, False),
+        ("minified", minified, False),
+        ("compact", compact, True),
+    ):
+        encoded = text.encode("utf-8")
+        parse_seconds = best_of(args.repeat, lambda: json.loads(text))
+        decode_ms = ""
+        if decode:
+            parsed = json.loads(text)
+            decode_ms = f"{best_of(args.repeat, lambda: catalog_compact.decode_catalog(parsed)) * 1000:.2f}"
+        print(
+            f"{name:<12}{len(encoded) / 1024:>9.1f}{len(gzip.compress(encoded, 9)) / 1024:>9.1f}"
+            f"{parse_seconds * 1000:>10.2f}{decode_ms:>11}"
+        )
+    print("Compact catalog decodes to the original payload")
+
+
+def scaled_catalog(products: list[dict[str, Any]], copies: int) -> list[dict[str, Any]]:
+    """The catalog repeated ``copies`` times with distinct product ids and variant codes."""
+    scaled = []
+    for copy in range(copies):
+        for product in products:
+            suffix = f"-{copy}" if copy else ""
+            scaled.append(
+                {
+                    **product,
+                    "id": product["id"] + suffix,
+                    "sizes": [
+                        {
+                            **size,
+                            "variants": [
+                                {**variant, "code": variant["code"] + suffix} for variant in size["variants"]
+                            ],
+                        }
+                        for size in product["sizes"]
+                    ],
+                }
+            )
+    return scaled
+
+
+def scan_search(products: list[dict[str, Any]], slugs_by_code: dict[str, str], query: str) -> list[str]:
+    """What the index answers, computed by tokenizing every product on each query."""
+    words = catalog_search.tokenize(query)
+    matches = []
+    for product in products:
+        tokens = catalog_search.tokenize(product["id"]) + catalog_search.tokenize(product["title"])
+        for size in product["sizes"]:
+            for variant in size["variants"]:
+                for value in (
+                    slugs_by_code.get(variant["code"]),
+                    variant["code"],
+                    variant["description"],
+                    variant["color"],
+                ):
+                    tokens += catalog_search.tokenize(value)
+        if words and all(any(token.startswith(word) for token in tokens) for word in words):
+            matches.append(product["id"])
+    return matches
+
+
+def bench_search_index(args: argparse.Namespace) -> None:
+    rows = gen.read_rows(args.xlsx, None, engine="xml", streaming=False)
+    products = [product.to_json() for product in gen.build_grouped_products(rows)]
+    slugs_by_code = {row.variant.code: row.title_en_slug for row in rows}
+    queries = ["λεκανη", "γλαστρ", "καδος πεδ", "ροζ", "1090", "pot self", "σκουπ"]
+
+    print(f"Workbook: {args.xlsx.name}, scale = copies of the catalog with distinct ids")
+    print(f"{'scale':>6}{'products':>10}{'variants':>10}{'tokens':>8}{'build ms':>10}{'KB':>9}{'gzip KB':>9}{'lookup µs':>11}{'scan ms':>9}")
+    for copies in args.scales:
+        catalog = scaled_catalog(products, copies)
+        # Each copy keeps the English slug of the variant it was copied from.
+        scaled_slugs = {
+            variant["code"]: slugs_by_code.get(original["code"], "")
+            for product, source in zip(catalog, products * copies)
+            for size, source_size in zip(product["sizes"], source["sizes"])
+            for variant, original in zip(size["variants"], source_size["variants"])
+        }
+        started = time.perf_counter()
+        index = catalog_search.build_search_index(catalog, scaled_slugs)
+        build_seconds = time.perf_counter() - started
+        encoded = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        started = time.perf_counter()
+        results = [catalog_search.search_index(index, query) for query in queries]
+        lookup_seconds = (time.perf_counter() - started) / len(queries)
+        started = time.perf_counter()
+        expected = [scan_search(catalog, scaled_slugs, query) for query in queries]
+        scan_seconds = (time.perf_counter() - started) / len(queries)
+        if results != expected:
+            raise SystemExit(f"index lookups differ from a full scan at scale {copies}")
+
+        variants_count = len(index["variants"])
+        print(
+            f"{copies:>6}{len(catalog):>10}{variants_count:>10}{len(index['tokens']):>8}"
+            f"{build_seconds * 1000:>10.1f}{len(encoded) / 1024:>9.1f}{len(gzip.compress(encoded, 9)) / 1024:>9.1f}"
+            f"{lookup_seconds * 1e6:>11.0f}{scan_seconds * 1000:>9.1f}"
+        )
+    print(f"Index lookups match a full scan for {len(queries)} queries")
+
+
+def scaled_rows(rows: list[CatalogRow], copies: int) -> list[CatalogRow]:
+    """The rows repeated ``copies`` times with distinct groups and variant codes."""
+    scaled = []
+    for copy in range(copies):
+        suffix = f"-{copy}" if copy else ""
+        for row in rows:
+            scaled.append(
+                replace(
+                    row,
+                    group_root=row.group_root + suffix,
+                    group_code=row.group_code + suffix,
+                    variant=replace(row.variant, code=row.variant.code + suffix),
+                )
+            )
+    return scaled
+
+
+def bench_diff(args: argparse.Namespace) -> None:
+    old_rows = gen.read_rows(args.old_xlsx, None, engine="xml", streaming=False)
+    new_rows = gen.read_rows(args.xlsx, None, engine="xml", streaming=False)
+
+    print(f"Workbooks: {args.old_xlsx.name} -> {args.xlsx.name}, scale = copies of both with distinct codes")
+    print(f"{'scale':>6}{'rows':>9}{'diff ms':>9}{'µs/row':>8}{'added':>7}{'removed':>8}{'changed':>8}{'groups':>7}")
+    for copies in args.scales:
+        old_scaled = scaled_rows(old_rows, copies)
+        new_scaled = scaled_rows(new_rows, copies)
+        delta: dict[str, Any] = {}
+
+        def run() -> None:
+            delta.update(gen.diff_catalog(old_scaled, new_scaled, {}))
+
+        seconds = best_of(args.repeat, run)
+        patched = catalog_diff.apply_row_delta(old_scaled, delta, gen.row_group_key)
+        if gen.build_grouped_products(patched) != gen.build_grouped_products(new_scaled):
+            raise SystemExit(f"patched rows do not rebuild the new catalog at scale {copies}")
+
+        rows_count = len(old_scaled) + len(new_scaled)
+        print(
+            f"{copies:>6}{rows_count:>9}{seconds * 1000:>9.1f}{seconds * 1e6 / rows_count:>8.2f}"
+            f"{len(delta['added']):>7}{len(delta['removed']):>8}{len(delta['changed']):>8}{len(delta['groups']):>7}"
+        )
+    print("Patched rows rebuild the new catalog at every scale")
+
+
+def synthetic_records(rows: int) -> Iterator[list[Any]]:
+    """Data rows (column A..BD values plus the F green-fill flag) shaped like the SITE sheet.
+
+    Each group starts with a W/X marker row, then has sizes of 6 colors
+    separated by a blank row. Data rows repeat the W/X markers as the real
+    sheet does; every third color is not green, every fourth size repeats a
+    code (dropped as a duplicate), and each size shares its BA-BD lifestyle
+    images between colors.
+    """
+    emitted = 0
+    group = 0
+    while True:
+        group += 1
+        group_root = str(1000 + group)
+        category = SYNTHETIC_CATEGORIES[group % len(SYNTHETIC_CATEGORIES)]
+        title = f"Συνθετικό προϊόν {group_root}"
+        lines: list[list[Any]] = []
+        marker = [None] * (gen.COL_LIFESTYLE_END + 1)
+        marker[gen.COL_GROUP_MARKER] = group_root
+        lines.append(marker + [False])
+        for size in range(1 + group % 4):
+            size_code = f"{group_root}{size}"
+            liters = 2 + size * 3.5
+            for color_index in range(6):
+                color = SYNTHETIC_COLORS[(group + size + color_index) % len(SYNTHETIC_COLORS)]
+                code = f"{size_code}-{color_index + 10}"
+                if size == 3 and color_index == 4:
+                    code = f"{size_code}-10"
+                values: list[Any] = [None] * (gen.COL_LIFESTYLE_END + 1)
+                values[gen.COL_GROUP_MARKER] = group_root
+                values[gen.COL_FAMILY_MARKER] = size_code
+                values[gen.COL_CODE] = code
+                values[gen.COL_DESCRIPTION] = (
+                    f"ΣΥΝΘΕΤΙΚΟ {liters:g}lt-d{30 + size * 4}x{12 + size}h cm-{color}".replace(".", ",")
+                )
+                values[gen.COL_COLOR] = color
+                values[gen.COL_PACK] = "10" if color_index % 2 else "0"
+                values[gen.COL_CATEGORY] = category
+                values[gen.COL_TITLE_GR] = title
+                values[gen.COL_TITLE_EN_SLUG] = f"Synthetic_{group_root}"
+                values[gen.COL_EXCEL_AR] = f"Κείμενο για το {title}, κατάλληλο για κάθε χρήση."
+                values[gen.COL_PACKSHOT] = f"https://viomes.gr/images/packshot_photos/viomes_{code}.jpg"
+                for offset, column in enumerate(range(gen.COL_LIFESTYLE_START, gen.COL_LIFESTYLE_END + 1)):
+                    values[column] = f"https://viomes.gr/images/catalogue_photos/{size_code}_{offset + 1}.jpg"
+                lines.append(values + [color_index % 3 != 2])
+            lines.append([None] * (gen.COL_LIFESTYLE_END + 1) + [False])
+        for line in lines:
+            yield line
+            emitted += 1
+            if emitted == rows:
+                return
+
+
+def write_synthetic_workbook(path: Path, rows: int) -> None:
+    green = PatternFill("solid", fgColor="FF" + gen.GREEN_FILL_HEX_SUFFIX)
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet("SITE")
+    # The generator reads from row 3; rows 1-2 are the sheet's headers.
+    header: list[Any] = [None] * (gen.COL_LIFESTYLE_END + 1)
+    for column, title in (
+        (gen.COL_CODE, "ΚΩΔΙΚΟΣ"),
+        (gen.COL_DESCRIPTION, "ΠΕΡΙΓΡΑΦΗ"),
+        (gen.COL_COLOR, "ΧΡΩΜΑ"),
+        (gen.COL_CATEGORY, "ΚΑΤΗΓΟΡΙΑ"),
+        (gen.COL_TITLE_GR, "ΕΛΛΗΝΙΚΗ ΠΕΡΙΓΡΑΦΗ SITE"),
+        (gen.COL_PACKSHOT, "PACKSHOT"),
+    ):
+        header[column] = title
+    worksheet.append(header)
+    worksheet.append([])
+    for record in synthetic_records(rows):
+        *values, is_green = record
+        cells: list[Any] = list(values)
+        if is_green:
+            cell = WriteOnlyCell(worksheet, value=values[gen.COL_DESCRIPTION])
+            cell.fill = green
+            cells[gen.COL_DESCRIPTION] = cell
+        worksheet.append(cells)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging_path = path.with_name(path.name + ".tmp")
+    workbook.save(staging_path)
+    staging_path.replace(path)
+
+
+def synthetic_workbook(rows: int) -> Path:
+    """Path of a cached synthetic workbook with ``rows`` data rows, written on first use."""
+    path = SYNTHETIC_CACHE / f"synthetic-v{SYNTHETIC_LAYOUT_VERSION}-{rows}.xlsx"
+    if not path.is_file():
+        write_synthetic_workbook(path, rows)
+    return path
+
+
+def synthetic_stage_timings(xlsx_path: Path, repeat: int) -> tuple[dict[str, float], int, int]:
+    """Best-of-``repeat`` seconds per generator stage, plus the kept row and product counts."""
+    rows = gen.read_rows(xlsx_path, None, engine="xml", streaming=False)
+    products = gen.build_grouped_products(rows)
+    descriptions = [row.variant.description for row in rows]
+
+    def serialize() -> None:
+        gen.serialize_products_payload(xlsx_path.name, [gen.serialize_product(product) for product in products])
+        json.dumps(gen.build_additional_images(rows), ensure_ascii=False, indent=2)
+
+    timings = {
+        "build_rows": best_of(repeat, lambda: gen.read_rows(xlsx_path, None, engine="xml", streaming=False)),
+        "build_grouped_products": best_of(
+            repeat,
+            lambda: gen.build_grouped_products(rows),
+            setup=catalog_specs.parse_normalized_specs.cache_clear,
+        ),
+        "parse_specs_from_text": best_of(
+            repeat,
+            lambda: [catalog_specs.parse_specs_from_text(description) for description in descriptions],
+            setup=catalog_specs.parse_normalized_specs.cache_clear,
+        ),
+        "build_additional_images": best_of(repeat, lambda: gen.build_additional_images(rows)),
+        "serialize": best_of(repeat, serialize),
+    }
+    return timings, len(rows), len(products)
+
+
+def bench_synthetic(args: argparse.Namespace) -> None:
+    baselines = json.loads(SYNTHETIC_BASELINES.read_text(encoding="utf-8")) if SYNTHETIC_BASELINES.is_file() else {}
+    results: dict[str, dict[str, float]] = {}
+    regressions = []
+
+    print(f"Synthetic workbooks, best of {args.repeat}, threshold {args.threshold:g}x baseline")
+    print(f"{'rows':>8}{'kept':>8}{'products':>10}  {'stage':<25}{'ms':>10}{'baseline':>10}{'ratio':>7}")
+    for rows in args.sizes:
+        xlsx_path = synthetic_workbook(rows)
+        timings, kept, products = synthetic_stage_timings(xlsx_path, args.repeat)
+        results[str(rows)] = {stage: round(seconds * 1000, 2) for stage, seconds in timings.items()}
+        for stage, seconds in timings.items():
+            milliseconds = seconds * 1000
+            baseline = baselines.get("synthetic", {}).get(str(rows), {}).get(stage)
+            ratio = milliseconds / baseline if baseline else None
+            flag = ""
+            # Stages under a few milliseconds are mostly timer noise.
+            if ratio and ratio > args.threshold and milliseconds - baseline > args.min_regression_ms:
+                regressions.append(f"{stage} at {rows} rows: {milliseconds:.1f} ms vs {baseline:.1f} ms baseline")
+                flag = "  REGRESSION"
+            print(
+                f"{rows:>8}{kept:>8}{products:>10}  {stage:<25}{milliseconds:>10.1f}"
+                f"{f'{baseline:.1f}' if baseline is not None else '-':>10}{f'{ratio:.2f}' if ratio else '-':>7}{flag}"
+            )
+
+    if args.update_baseline:
+        baselines["machine"] = f"{platform.machine()} {platform.python_implementation()} {platform.python_version()}"
+        baselines.setdefault("synthetic", {}).update(results)
+        SYNTHETIC_BASELINES.write_text(json.dumps(baselines, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {SYNTHETIC_BASELINES}")
+        return
+    if regressions:
+        for regression in regressions:
+            print(f"  {regression}")
+        raise SystemExit(f"{len(regressions)} stages slower than {args.threshold:g}x their baseline")
+    print("No stage slower than its baseline threshold")
+
+
+def run_build_worker(xlsx_path: Path, mode: str) -> dict[str, Any]:
+    """A full build_catalog run without URL validation, buffered or with --stream-groups."""
+    with tempfile.TemporaryDirectory() as tmp:
+        products_path = Path(tmp) / "products-grouped.json"
+        argv = [
+            "generate_catalog_json.py",
+            "--xlsx", str(xlsx_path),
+            "--engine", "xml",
+            "--skip-url-validation",
+            "--force",
+            "--build-cache", str(Path(tmp) / "catalog-build.json"),
+            "--products-out", str(products_path),
+            "--additional-out", str(Path(tmp) / "additional-images.json"),
+        ]
+        if mode == "streamed":
+            argv.append("--stream-groups")
+        started = time.perf_counter()
+        # stdout carries this worker's JSON result, so keep the build's summary off it.
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+            gen.build_catalog(gen.parse_args())
+        seconds = time.perf_counter() - started
+        products_text = products_path.read_text(encoding="utf-8")
+    return {
+        "mode": mode,
+        "products": json.loads(products_text)["products_count"],
+        "seconds": seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "sha256": hashlib.sha256(products_text.encode("utf-8")).hexdigest(),
+    }
+
+
+def check_out_of_order_groups(xlsx_path: Path) -> None:
+    """Streamed groups match group_rows_by_key, also when groups resume after they were yielded."""
+    rows = gen.read_rows(xlsx_path, None, engine="xml", streaming=False)
+    # Deal the rows out round-robin in chunks so most groups resume far down.
+    chunks = [rows[start:start + 7] for start in range(0, len(rows), 7)]
+    interleaved = [row for offset in range(3) for chunk in chunks[offset::3] for row in chunk]
+    for layout, source in (("as laid out", rows), ("interleaved", interleaved)):
+        reread = []
+        for window in (0, 2, gen.STREAM_GROUP_WINDOW):
+            stats: Counter[str] = Counter()
+            streamed = dict(gen.iter_ordered_groups(source, lambda: source, window, stats))
+            if streamed != gen.group_rows_by_key(source):
+                raise SystemExit(f"Streamed groups differ from buffered ones ({layout}, window {window})")
+            reread.append(f"{stats['groups_out_of_order']} at window {window}")
+        print(f"{xlsx_path.name} {layout}: groups re-read {', '.join(reread)}; all rebuilt whole")
+
+
+def bench_stream_groups(args: argparse.Namespace) -> None:
+    check_out_of_order_groups(args.xlsx)
+    print(f"{'rows':>8}{'mode':>10}{'products':>10}{'best s':>9}{'peak RSS MB':>13}")
+    for rows in args.sizes:
+        xlsx_path = synthetic_workbook(rows)
+        digests = set()
+        for mode in ("buffered", "streamed"):
+            results = [
+                run_in_subprocess("build-worker", "--mode", mode, "--xlsx", str(xlsx_path))
+                for _ in range(args.repeat)
+            ]
+            digests.update(result["sha256"] for result in results)
+            best = min(result["seconds"] for result in results)
+            peak = max(result["peak_rss_mb"] for result in results)
+            print(
+                f"{rows:>8}{mode:>10}{results[0]['products']:>10}{best:>9.2f}{peak:>13.1f}"
+            )
+        if len(digests) != 1:
+            raise SystemExit(f"Streamed products differ from buffered ones at {rows} rows")
+    print("Streamed and buffered products are identical at every size")
+
+
+def bench_records(args: argparse.Namespace) -> None:
+    """Per-row memory of slotted row records against the nested dicts they serialize to."""
+    xlsx_path = synthetic_workbook(args.rows)
+    tracemalloc.start()
+    started_memory = tracemalloc.get_traced_memory()[0]
+    rows = gen.read_rows(xlsx_path, None, engine="xml", streaming=False)
+    traced = tracemalloc.get_traced_memory()[0] - started_memory
+    tracemalloc.stop()
+
+    # Strings and image lists are the same objects either way; only the
+    # containers around them differ.
+    record_bytes = sum(sys.getsizeof(row) + sys.getsizeof(row.variant) for row in rows)
+    dict_rows = [row.to_json() for row in rows]
+    dict_bytes = sum(sys.getsizeof(row) + sys.getsizeof(row["variant"]) for row in dict_rows)
+    if [CatalogRow.from_json(row) for row in dict_rows] != rows:
+        raise SystemExit("Rows do not round-trip through to_json/from_json")
+
+    count = len(rows)
+    print(f"Synthetic workbook, {args.rows} rows ({count} kept)")
+    print(f"{'':<28}{'bytes/row':>10}{'MB':>8}")
+    print(f"{'rows as read (traced)':<28}{traced / count:>10.0f}{traced / 1024 / 1024:>8.1f}")
+    print(f"{'row + variant, records':<28}{record_bytes / count:>10.0f}{record_bytes / 1024 / 1024:>8.1f}")
+    print(f"{'row + variant, dicts':<28}{dict_bytes / count:>10.0f}{dict_bytes / 1024 / 1024:>8.1f}")
+    print(f"Records save {(dict_bytes - record_bytes) / count:.0f} bytes per row; rows round-trip through to_json")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the catalog JSON generator.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest = subparsers.add_parser(
+        "ingest",
+        help="Compare workbook ingestion modes (wall time and peak RSS).",
+    )
+    ingest.add_argument("--xlsx", type=Path, default=DEFAULT_XLSX)
+    ingest.add_argument("--repeat", type=int, default=1)
+
+    url_cache = subparsers.add_parser(
+        "url-cache",
+        help="Cold, revalidating and warm URL-cache runs against a local stand-in image host.",
+    )
+    url_cache.add_argument("--codes", type=int, default=500)
+    url_cache.add_argument("--workers", type=int, default=24)
+
+    url_throughput = subparsers.add_parser(
+        "url-throughput",
+        help="URLs/s of the threads vs asyncio URL backends against a latency-injecting stand-in host.",
+    )
+    url_throughput.add_argument("--urls", type=int, default=2000)
+    url_throughput.add_argument("--latency", type=float, default=0.02, help="Seconds added to every response.")
+    url_throughput.add_argument("--workers", type=int, default=24)
+    url_throughput.add_argument("--per-host", type=int, default=24)
+
+    url_throttle = subparsers.add_parser(
+        "url-throttle",
+        help="URL checks against a stand-in host that answers 429 + Retry-After above a concurrency cap.",
+    )
+    url_throttle.add_argument("--codes", type=int, default=300)
+    url_throttle.add_argument("--latency", type=float, default=0.02)
+    url_throttle.add_argument("--max-in-flight", type=int, default=6)
+    url_throttle.add_argument("--workers", type=int, default=24)
+
+    url_deadline = subparsers.add_parser(
+        "url-deadline",
+        help="Deadline-bounded URL validation: newest URLs first, the rest keep their last status.",
+    )
+    url_deadline.add_argument("--codes", type=int, default=400)
+    url_deadline.add_argument("--latency", type=float, default=0.1)
+    url_deadline.add_argument("--deadline", type=float, default=1.5)
+    url_deadline.add_argument("--workers", type=int, default=24)
+
+    pipeline = subparsers.add_parser(
+        "pipeline",
+        help="Sequential vs pipelined builds of the workbook, from scratch and after one group changes, URLs on a stand-in host.",
+    )
+    pipeline.add_argument("--xlsx", type=Path, default=DEFAULT_XLSX)
+    pipeline.add_argument("--latency", type=float, default=0.02)
+    pipeline.add_argument("--workers", type=int, default=24)
+    pipeline.add_argument("--backend", choices=gen.URL_BACKENDS, default="asyncio")
+
+    specs = subparsers.add_parser(
+        "specs",
+        help="Check spec parsing against the golden corpus and time it per call vs memoized.",
+    )
+    specs.add_argument("--xlsx", type=Path, default=DEFAULT_XLSX)
+    specs.add_argument("--repeat", type=int, default=5)
+    specs.add_argument(
+        "--update-golden",
+        action="store_true",
+        help="Rewrite specs-golden.json from the workbook with the current parser (after an intended rule change).",
+    )
+
+    compact = subparsers.add_parser(
+        "compact",
+        help="Size and parse time of products-grouped.json: pretty, minified and compact string-table format.",
+    )
+    compact.add_argument("--products", type=Path, default=DEFAULT_PRODUCTS_JSON)
+    compact.add_argument("--repeat", type=int, default=10)
+
+    search_index = subparsers.add_parser(
+        "search-index",
+        help="Search index build time and size against catalog size, lookups checked against a full scan.",
+    )
+    search_index.add_argument("--xlsx", type=Path, default=DEFAULT_XLSX)
+    search_index.add_argument("--scales", type=int, nargs="+", default=[1, 4, 16])
+
+    diff = subparsers.add_parser(
+        "diff",
+        help="Workbook diff time against row count (old and new workbooks scaled), patches checked.",
+    )
+    diff.add_argument("--old-xlsx", type=Path, default=DEFAULT_OLD_XLSX)
+    diff.add_argument("--xlsx", type=Path, default=DEFAULT_XLSX)
+    diff.add_argument("--scales", type=int, nargs="+", default=[1, 4, 16])
+    diff.add_argument("--repeat", type=int, default=3)
+
+    synthetic = subparsers.add_parser(
+        "synthetic",
+        help=(
+            "Per-stage generator timings on synthetic workbooks with the SITE column layout, "
+            "compared with bench-baselines.json; fails when a stage exceeds the threshold."
+        ),
+    )
+    synthetic.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    synthetic.add_argument("--repeat", type=int, default=3)
+    synthetic.add_argument("--threshold", type=float, default=1.5, help="Allowed slowdown against the baseline.")
+    synthetic.add_argument(
+        "--min-regression-ms",
+        type=float,
+        default=5.0,
+        help="Ignore slowdowns smaller than this many milliseconds.",
+    )
+    synthetic.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline.")
+
+    stream_groups = subparsers.add_parser(
+        "stream-groups",
+        help="Peak RSS and time of full builds, buffered vs --stream-groups, on synthetic workbooks, outputs checked.",
+    )
+    stream_groups.add_argument("--xlsx", type=Path, default=DEFAULT_XLSX, help="Workbook for the out-of-order check.")
+    stream_groups.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    stream_groups.add_argument("--repeat", type=int, default=1)
+
+    records = subparsers.add_parser(
+        "records",
+        help="Per-row memory of the slotted row records vs the nested dicts they serialize to.",
+    )
+    records.add_argument("--rows", type=int, default=100000)
+
+    ingest_worker = subparsers.add_parser("ingest-worker")
+    ingest_worker.add_argument("--xlsx", type=Path, required=True)
+    ingest_worker.add_argument("--mode", choices=INGEST_MODES, required=True)
+
+    build_worker = subparsers.add_parser("build-worker")
+    build_worker.add_argument("--xlsx", type=Path, required=True)
+    build_worker.add_argument("--mode", choices=("buffered", "streamed"), required=True)
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "ingest":
+        bench_ingest(args)
+    elif args.command == "url-cache":
+        bench_url_cache(args)
+    elif args.command == "url-throughput":
+        bench_url_throughput(args)
+    elif args.command == "url-throttle":
+        bench_url_throttle(args)
+    elif args.command == "url-deadline":
+        bench_url_deadline(args)
+    elif args.command == "pipeline":
+        bench_pipeline(args)
+    elif args.command == "specs":
+        bench_specs(args)
+    elif args.command == "compact":
+        bench_compact(args)
+    elif args.command == "search-index":
+        bench_search_index(args)
+    elif args.command == "diff":
+        bench_diff(args)
+    elif args.command == "synthetic":
+        bench_synthetic(args)
+    elif args.command == "stream-groups":
+        bench_stream_groups(args)
+    elif args.command == "records":
+        bench_records(args)
+    elif args.command == "ingest-worker":
+        print(json.dumps(run_ingest_worker(args.xlsx, args.mode)))
+    elif args.command == "build-worker":
+        print(json.dumps(run_build_worker(args.xlsx, args.mode)))
+
+
+if __name__ == "__main__":
+    main()
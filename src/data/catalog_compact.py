@@ -0,0 +1,190 @@
+"""
+Compact, string-table encoding of products-grouped.json.
+
+Every string (titles, colors, ``excel_ar`` paragraphs, image URLs, spec
+values) is stored once in ``strings`` and referenced by index. Objects become
+positional arrays whose field order is listed in ``fields``, and image URLs
+drop the shared packshot prefix. ``decode_catalog`` is the reference decoder:
+it turns the compact form back into the exact products-grouped.json payload.
+
+Layout::
+
+    {
+      "format": "viomes-catalog-compact/1",
+      "fields": {"product": [...], "size": [...], "variant": [...], "specs": [...]},
+      "image_prefix": "https://viomes.gr/images/packshot_photos/",
+      "strings": ["...", ...],
+      "source_file": <string index>,
+      "products": [[<product fields>], ...]
+    }
+
+Image fields hold the index of the URL without the prefix. Absolute URLs
+(containing ``://``) that do not start with it are stored whole; any other
+value (a stray cell such as ``"`"``) is stored verbatim as ``[<index>]``, so
+the decoder never adds the prefix to it. ``specs.has_specs`` is not stored; it is true
+when any spec value is set. ``subcategory`` (only on products split by
+family grouping rules) is null when absent, and the payload's
+``family_grouping_applied`` flag is copied as is.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+COMPACT_FORMAT = "viomes-catalog-compact/1"
+IMAGE_PREFIX = "https://viomes.gr/images/packshot_photos/"
+
+PRODUCT_FIELDS = (
+    "id",
+    "family_indicator",
+    "group_root",
+    "title",
+    "category",
+    "representative_image",
+    "sizes",
+    "sizes_count",
+    "variants_count",
+    "subcategory",
+)
+# Product fields left out of the decoded product when stored as null.
+OPTIONAL_PRODUCT_FIELDS = frozenset({"subcategory"})
+SIZE_FIELDS = ("size_label", "size_code", "variants", "colors_count", "specs")
+VARIANT_FIELDS = ("code", "description", "color", "image_url", "pack", "excel_ar")
+SPECS_FIELDS = ("liters", "width", "depth", "box_height", "diameter", "height")
+IMAGE_FIELDS = frozenset({"representative_image", "image_url"})
+
+
+class StringTable:
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self.index_by_string: dict[str, int] = {}
+
+    def ref(self, value: str) -> int:
+        index = self.index_by_string.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.index_by_string[value] = index
+            self.strings.append(value)
+        return index
+
+
+def encode_image(table: StringTable, url: str) -> int | list[int]:
+    if url.startswith(IMAGE_PREFIX):
+        return table.ref(url[len(IMAGE_PREFIX):])
+    if not url or "://" in url:
+        return table.ref(url)
+    # Not under the prefix and not absolute: the decoder must not add the prefix.
+    return [table.ref(url)]
+
+
+def restore_image_prefix(value: str) -> str:
+    if not value or "://" in value:
+        return value
+    return IMAGE_PREFIX + value
+
+
+def encode_value(table: StringTable, field: str, value: Any) -> Any:
+    if isinstance(value, str):
+        return encode_image(table, value) if field in IMAGE_FIELDS else table.ref(value)
+    # ints and nulls are stored as they are
+    return value
+
+
+def encode_catalog(payload: dict[str, Any]) -> dict[str, Any]:
+    """Encode a products-grouped.json payload into the compact form."""
+    table = StringTable()
+    source_file = table.ref(payload["source_file"])
+
+    def encode_size(size: dict[str, Any]) -> list[Any]:
+        row = []
+        for field in SIZE_FIELDS:
+            if field == "variants":
+                row.append(
+                    [
+                        [encode_value(table, name, variant[name]) for name in VARIANT_FIELDS]
+                        for variant in size["variants"]
+                    ]
+                )
+            elif field == "specs":
+                row.append([encode_value(table, name, size["specs"][name]) for name in SPECS_FIELDS])
+            else:
+                row.append(encode_value(table, field, size[field]))
+        return row
+
+    products = []
+    for product in payload["products"]:
+        products.append(
+            [
+                [encode_size(size) for size in product["sizes"]]
+                if field == "sizes"
+                else encode_value(table, field, product.get(field))
+                for field in PRODUCT_FIELDS
+            ]
+        )
+
+    compact = {
+        "format": COMPACT_FORMAT,
+        "fields": {
+            "product": list(PRODUCT_FIELDS),
+            "size": list(SIZE_FIELDS),
+            "variant": list(VARIANT_FIELDS),
+            "specs": list(SPECS_FIELDS),
+        },
+        "image_prefix": IMAGE_PREFIX,
+        "strings": table.strings,
+        "source_file": source_file,
+        "products": products,
+    }
+    if payload.get("family_grouping_applied"):
+        compact["family_grouping_applied"] = True
+    return compact
+
+
+def decode_catalog(compact: dict[str, Any]) -> dict[str, Any]:
+    """Reference decoder: rebuild the products-grouped.json payload."""
+    if compact.get("format") != COMPACT_FORMAT:
+        raise ValueError(f"Unsupported compact catalog format: {compact.get('format')!r}")
+    strings = compact["strings"]
+    fields = compact["fields"]
+
+    def decode_value(field: str, value: Any) -> Any:
+        if field.endswith("_count") or value is None:
+            return value
+        if isinstance(value, list):
+            # An image value stored verbatim.
+            return strings[value[0]]
+        text = strings[value]
+        return restore_image_prefix(text) if field in IMAGE_FIELDS else text
+
+    def decode_size(row: list[Any]) -> dict[str, Any]:
+        size: dict[str, Any] = {}
+        for field, value in zip(fields["size"], row):
+            if field == "variants":
+                size[field] = [
+                    {name: decode_value(name, item) for name, item in zip(fields["variant"], variant)}
+                    for variant in value
+                ]
+            elif field == "specs":
+                specs = {name: decode_value(name, item) for name, item in zip(fields["specs"], value)}
+                specs["has_specs"] = any(specs.values())
+                size[field] = specs
+            else:
+                size[field] = decode_value(field, value)
+        return size
+
+    products = [
+        {
+            field: [decode_size(size) for size in value] if field == "sizes" else decode_value(field, value)
+            for field, value in zip(fields["product"], row)
+            if not (value is None and field in OPTIONAL_PRODUCT_FIELDS)
+        }
+        for row in compact["products"]
+    ]
+    payload: dict[str, Any] = {
+        "source_file": strings[compact["source_file"]],
+        "products_count": len(products),
+    }
+    if compact.get("family_grouping_applied"):
+        payload["family_grouping_applied"] = True
+    payload["products"] = products
+    return payload
@@ -0,0 +1,190 @@
+"""
+Keyed delta between two workbook revisions.
+
+Rows (as ``build_rows`` yields them) are matched by variant code, so a diff
+is a handful of dict lookups per row and runs in time linear in the row
+count. Layout::
+
+    {
+      "format": "viomes-catalog-delta/1",
+      "from": "ΚΑΤΑΣΤΑΣΗ ΕΙΔΩΝ ΚΑΙ ΠΕΡΙΓΡΑΦΕΣ SITE_old.xlsx",
+      "to": "ΚΑΤΑΣΤΑΣΗ ΕΙΔΩΝ ΚΑΙ ΠΕΡΙΓΡΑΦΕΣ SITE.xlsx",
+      "added": {"360-99": {<row>}, ...},                     # code -> full row (CatalogRow.to_json)
+      "removed": ["360-12", ...],
+      "changed": {"360-78": {"variant.color": "ΛΕΥΚΟ"}, ...},  # code -> new field values
+      "moved": {"360-80": ["1090", "1100"], ...},             # code -> [old group, new group]
+      "groups": {"1090": ["360-78", ...], "1200": null},      # new code order of changed groups
+      "family_grouping_applied": false,
+      "products": {"upsert": [<product>, ...], "remove": [["<group_root>", "<id>"], ...]},
+      "additional_images": {"360-78": ["https://..."], "360-12": null}
+    }
+
+Row fields are flattened for ``changed`` (``variant.<name>`` for variant
+fields). A group is listed under ``groups`` when its code sequence changed:
+rows added, removed, reordered or moved in from or out to another group;
+null means the group is gone. Group keys are those of ``group_rows_by_key``.
+
+``apply_row_delta`` turns the old rows into rows that build the new catalog.
+``products`` and ``additional_images`` are the same delta at the output
+level, for clients that already hold the previous products-grouped.json and
+additional-images.json: ``apply_catalog_delta`` replaces the products of
+every touched group and updates image lists (null removes the code). Both
+are built without URL validation, and with family grouping splits only when
+``family_grouping_applied`` is true, which must match the payload's flag.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any, Callable
+
+from catalog_records import CatalogRow
+
+DELTA_FORMAT = "viomes-catalog-delta/1"
+ROW_FIELDS = (
+    "group_root",
+    "family_indicator",
+    "group_code",
+    "title",
+    "title_en_slug",
+    "category",
+    "size_code",
+    "additional_images",
+)
+VARIANT_FIELDS = ("code", "description", "color", "image_url", "pack", "excel_ar")
+
+GroupKey = Callable[[CatalogRow], str]
+
+
+def flatten_row(row: CatalogRow) -> dict[str, Any]:
+    flat = {field: getattr(row, field) for field in ROW_FIELDS}
+    flat.update((f"variant.{field}", getattr(row.variant, field)) for field in VARIANT_FIELDS)
+    return flat
+
+
+def code_sequences(rows: list[CatalogRow], group_key: GroupKey) -> dict[str, list[str]]:
+    sequences: dict[str, list[str]] = {}
+    for row in rows:
+        sequences.setdefault(group_key(row), []).append(row.variant.code)
+    return sequences
+
+
+def diff_rows(old_rows: list[CatalogRow], new_rows: list[CatalogRow], group_key: GroupKey) -> dict[str, Any]:
+    """Row-level delta from ``old_rows`` to ``new_rows`` (codes are unique in each)."""
+    old_by_code = {row.variant.code: row for row in old_rows}
+    new_by_code = {row.variant.code: row for row in new_rows}
+
+    added = {code: row.to_json() for code, row in new_by_code.items() if code not in old_by_code}
+    removed = [code for code in old_by_code if code not in new_by_code]
+    changed: dict[str, dict[str, Any]] = {}
+    moved: dict[str, list[str]] = {}
+    for code, new_row in new_by_code.items():
+        old_row = old_by_code.get(code)
+        if old_row is None or old_row == new_row:
+            continue
+        old_flat = flatten_row(old_row)
+        changed[code] = {field: value for field, value in flatten_row(new_row).items() if old_flat[field] != value}
+        old_group, new_group = group_key(old_row), group_key(new_row)
+        if old_group != new_group:
+            moved[code] = [old_group, new_group]
+
+    old_sequences = code_sequences(old_rows, group_key)
+    new_sequences = code_sequences(new_rows, group_key)
+    groups: dict[str, list[str] | None] = {
+        key: sequence for key, sequence in new_sequences.items() if old_sequences.get(key) != sequence
+    }
+    groups.update((key, None) for key in old_sequences if key not in new_sequences)
+
+    return {
+        "format": DELTA_FORMAT,
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "moved": moved,
+        "groups": groups,
+    }
+
+
+def touched_groups(
+    delta: dict[str, Any],
+    old_rows: list[CatalogRow],
+    new_rows: list[CatalogRow],
+    group_key: GroupKey,
+) -> set[str]:
+    """Groups whose rows differ between the revisions (old and new keys of every touched code)."""
+    codes = delta["added"].keys() | set(delta["removed"]) | delta["changed"].keys()
+    touched = set(delta["groups"])
+    for row in (*old_rows, *new_rows):
+        if row.variant.code in codes:
+            touched.add(group_key(row))
+    return touched
+
+
+def apply_row_delta(old_rows: list[CatalogRow], delta: dict[str, Any], group_key: GroupKey) -> list[CatalogRow]:
+    """Reference patch: rows that build the same catalog as the delta's new workbook.
+
+    Rows come back grouped, old groups first and new groups after them. The
+    build only depends on the row order within each group, which matches the
+    new workbook.
+    """
+    if delta.get("format") != DELTA_FORMAT:
+        raise ValueError(f"Unsupported catalog delta format: {delta.get('format')!r}")
+
+    rows_by_code = {row.variant.code: row for row in old_rows}
+    for code in delta["removed"]:
+        del rows_by_code[code]
+    for code, changes in delta["changed"].items():
+        row = replace(rows_by_code[code], variant=replace(rows_by_code[code].variant))
+        for field, value in changes.items():
+            if field.startswith("variant."):
+                setattr(row.variant, field[len("variant."):], value)
+            else:
+                setattr(row, field, value)
+        rows_by_code[code] = row
+    rows_by_code.update((code, CatalogRow.from_json(data)) for code, data in delta["added"].items())
+
+    sequences: dict[str, list[str] | None] = dict(code_sequences(old_rows, group_key))
+    sequences.update(delta["groups"])
+    return [rows_by_code[code] for sequence in sequences.values() if sequence for code in sequence]
+
+
+def apply_catalog_delta(
+    payload: dict[str, Any],
+    additional_images: dict[str, list[str]],
+    delta: dict[str, Any],
+) -> tuple[dict[str, Any], dict[str, list[str]]]:
+    """Reference patch for products-grouped.json and additional-images.json contents."""
+    if delta.get("format") != DELTA_FORMAT:
+        raise ValueError(f"Unsupported catalog delta format: {delta.get('format')!r}")
+    if bool(payload.get("family_grouping_applied")) != delta["family_grouping_applied"]:
+        raise ValueError("Catalog delta and payload disagree on family grouping splits")
+
+    upsert = delta["products"]["upsert"]
+    replaced = {tuple(key) for key in delta["products"]["remove"]}
+    replaced.update((product["group_root"], product["id"]) for product in upsert)
+    products = [product for product in payload["products"] if (product["group_root"], product["id"]) not in replaced]
+    products.extend(upsert)
+    # The generator orders groups by (group_root, title, id) and lists a
+    # split group's products in rule order. A group_root names a single
+    # group, so products sharing one move together, keyed by the first;
+    # products without one are groups of their own.
+    runs: list[list[dict[str, Any]]] = []
+    for product in products:
+        if runs and product["group_root"] and runs[-1][0]["group_root"] == product["group_root"]:
+            runs[-1].append(product)
+        else:
+            runs.append([product])
+    runs.sort(key=lambda run: (run[0]["group_root"], run[0]["title"], run[0]["id"]))
+    products = [product for run in runs for product in run]
+
+    images = dict(additional_images)
+    for code, urls in delta["additional_images"].items():
+        if urls is None:
+            images.pop(code, None)
+        else:
+            images[code] = urls
+    patched: dict[str, Any] = {"source_file": delta["to"], "products_count": len(products)}
+    if payload.get("family_grouping_applied"):
+        patched["family_grouping_applied"] = True
+    patched["products"] = products
+    return patched, dict(sorted(images.items()))
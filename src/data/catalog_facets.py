@@ -0,0 +1,99 @@
+"""
+Facet and numeric-range index for catalog filtering.
+
+Layout::
+
+    {
+      "format": "viomes-facet-index/1",
+      "products": ["1090", ...],                   # product ids
+      "facets": {
+        "category": {"Γλάστρες": [3, 4], ...},     # value -> product indexes
+        "color": {...},
+        "family_indicator": {...}
+      },
+      "ranges": {
+        "liters": {"values": [0.5, 1.0, ...], "products": [7, 2, ...]},
+        ...
+      }
+    }
+
+Facet counts are the lengths of the posting lists. Each range holds every
+size's spec value (from ``sizes[].specs``, as parsed by catalog_specs) sorted
+ascending, with the owning product index at the same position, so a range
+query is two binary searches and a slice. A product appears once per size
+that has the value.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any
+
+FACET_INDEX_FORMAT = "viomes-facet-index/1"
+FACET_FIELDS = ("category", "color", "family_indicator")
+RANGE_FIELDS = ("liters", "diameter", "height", "width")
+
+
+def facet_values(product: dict[str, Any], field: str) -> set[str]:
+    if field == "color":
+        values = {
+            str(variant["color"]).strip()
+            for size in product["sizes"]
+            for variant in size["variants"]
+            if variant.get("color") is not None
+        }
+    else:
+        values = {str(product.get(field) or "").strip()}
+    # Empty values and the "nan" placeholder carry no facet.
+    return {value for value in values if value and value.lower() != "nan"}
+
+
+def spec_number(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_facet_index(products: list[dict[str, Any]]) -> dict[str, Any]:
+    """Index products (as in products-grouped.json) by facet value and numeric spec."""
+    facets: dict[str, dict[str, list[int]]] = {field: {} for field in FACET_FIELDS}
+    points: dict[str, list[tuple[float, int]]] = {field: [] for field in RANGE_FIELDS}
+
+    for product_index, product in enumerate(products):
+        for field in FACET_FIELDS:
+            for value in facet_values(product, field):
+                facets[field].setdefault(value, []).append(product_index)
+        for size in product["sizes"]:
+            specs = size.get("specs") or {}
+            for field in RANGE_FIELDS:
+                number = spec_number(specs.get(field))
+                if number is not None:
+                    points[field].append((number, product_index))
+
+    ranges = {}
+    for field, field_points in points.items():
+        field_points.sort()
+        ranges[field] = {
+            "values": [value for value, _ in field_points],
+            "products": [product_index for _, product_index in field_points],
+        }
+    return {
+        "format": FACET_INDEX_FORMAT,
+        "products": [product["id"] for product in products],
+        "facets": {field: dict(sorted(values.items())) for field, values in facets.items()},
+        "ranges": ranges,
+    }
+
+
+def facet_counts(index: dict[str, Any], field: str) -> dict[str, int]:
+    return {value: len(product_indexes) for value, product_indexes in index["facets"][field].items()}
+
+
+def range_query(index: dict[str, Any], field: str, low: float | None, high: float | None) -> list[str]:
+    """Reference lookup: ids of products with a size whose ``field`` lies in [low, high]."""
+    values = index["ranges"][field]["values"]
+    start = 0 if low is None else bisect_left(values, low)
+    end = len(values) if high is None else bisect_right(values, high)
+    matches = set(index["ranges"][field]["products"][start:end])
+    return [index["products"][product_index] for product_index in sorted(matches)]
@@ -0,0 +1,125 @@
+"""
+Paginated per-category listing pages for the catalog.
+
+Products are split by ``category`` (one of the three values
+``resolve_site_category_from_excel`` produces) and kept in
+products-grouped.json order, which is the order the site lists them in.
+Each page holds only what a product card shows, so the first page of a
+category is small enough to inline in the HTML or preload; later pages are
+fetched as the visitor scrolls.
+
+Layout::
+
+    index.json
+    {
+      "format": "viomes-listings/1",
+      "categories": [
+        {
+          "category": "Γλάστρες",
+          "slug": "planters",
+          "products_count": 120,
+          "pages": ["planters/page-1.json", ...]   # relative to index.json
+        },
+        ...
+      ]
+    }
+
+    planters/page-1.json
+    {
+      "category": "Γλάστρες",
+      "page": 1,
+      "pages_count": 4,
+      "products": [
+        {"id": "1090", "title": "...", "representative_image": "...",
+         "sizes_count": 3, "variants_count": 12, "colors": ["..."]},
+        ...
+      ]
+    }
+
+``colors`` lists up to LISTING_COLORS distinct colors in variant order, as
+the card swatches do. ``subcategory`` is added only for products split by
+family grouping rules. Every category gets at least one (possibly empty)
+page.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+LISTINGS_FORMAT = "viomes-listings/1"
+# Slugs for the site categories; Greek names do not survive ASCII slugging.
+CATEGORY_SLUGS = {
+    "Είδη Σπιτιού": "home-items",
+    "Γλάστρες": "planters",
+    "Επαγγελματικός Εξοπλισμός": "professional",
+}
+CARD_FIELDS = ("id", "title", "representative_image", "sizes_count", "variants_count")
+# Category pages preview 6 products and cards show at most 10 swatches.
+FIRST_PAGE_SIZE = 6
+PAGE_SIZE = 48
+LISTING_COLORS = 10
+
+
+def card_colors(product: dict[str, Any]) -> list[str]:
+    colors: dict[str, None] = {}
+    for size in product["sizes"]:
+        for variant in size["variants"]:
+            color = str(variant.get("color") or "").strip()
+            if color and color.lower() != "nan":
+                colors.setdefault(color)
+    return list(colors)[:LISTING_COLORS]
+
+
+def product_card(product: dict[str, Any]) -> dict[str, Any]:
+    card = {field: product[field] for field in CARD_FIELDS}
+    card["colors"] = card_colors(product)
+    if product.get("subcategory"):
+        card["subcategory"] = product["subcategory"]
+    return card
+
+
+def paginate(items: list[Any], first_page_size: int, page_size: int) -> list[list[Any]]:
+    pages = [items[:first_page_size]]
+    for start in range(first_page_size, len(items), page_size):
+        pages.append(items[start:start + page_size])
+    return pages
+
+
+def build_category_listings(
+    products: list[dict[str, Any]],
+    first_page_size: int = FIRST_PAGE_SIZE,
+    page_size: int = PAGE_SIZE,
+) -> dict[str, Any]:
+    """Listing files (as in products-grouped.json order) as relative path -> data, index.json first."""
+    if first_page_size < 1 or page_size < 1:
+        raise ValueError("Listing page sizes must be at least 1")
+
+    cards_by_category: dict[str, list[dict[str, Any]]] = {category: [] for category in CATEGORY_SLUGS}
+    for product in products:
+        category = product["category"]
+        if category not in cards_by_category:
+            raise ValueError(f"Product {product['id']} has no listing category: {category!r}")
+        cards_by_category[category].append(product_card(product))
+
+    index: dict[str, Any] = {"format": LISTINGS_FORMAT, "categories": []}
+    files: dict[str, Any] = {"index.json": index}
+    for category, cards in cards_by_category.items():
+        slug = CATEGORY_SLUGS[category]
+        pages = paginate(cards, first_page_size, page_size)
+        page_paths = [f"{slug}/page-{number}.json" for number in range(1, len(pages) + 1)]
+        for number, (path, page_cards) in enumerate(zip(page_paths, pages), start=1):
+            files[path] = {
+                "category": category,
+                "page": number,
+                "pages_count": len(pages),
+                "products": page_cards,
+            }
+        index["categories"].append(
+            {
+                "category": category,
+                "slug": slug,
+                "products_count": len(cards),
+                "pages": page_paths,
+            }
+        )
+    return files
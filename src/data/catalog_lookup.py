@@ -0,0 +1,46 @@
+"""
+Variant-code and group lookup index for detail pages.
+
+Layout::
+
+    {
+      "format": "viomes-code-index/1",
+      "codes": {"360-78": ["1090", 0, 0], ...},  # code -> [product id, size index, variant index]
+      "groups": {"1090": ["1090"], ...}           # group_root -> product ids
+    }
+
+Size and variant indexes point into the product's ``sizes`` and
+``sizes[].variants`` in products-grouped.json (or its shard). A group lists
+several products when family grouping rules split it.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+CODE_INDEX_FORMAT = "viomes-code-index/1"
+
+
+def build_code_index(products: list[dict[str, Any]]) -> dict[str, Any]:
+    codes: dict[str, list[Any]] = {}
+    groups: dict[str, list[str]] = {}
+    for product in products:
+        groups.setdefault(product["group_root"], []).append(product["id"])
+        for size_index, size in enumerate(product["sizes"]):
+            for variant_index, variant in enumerate(size["variants"]):
+                # Codes are unique after deduplication; keep the first if not.
+                codes.setdefault(variant["code"], [product["id"], size_index, variant_index])
+    return {
+        "format": CODE_INDEX_FORMAT,
+        "codes": codes,
+        "groups": groups,
+    }
+
+
+def resolve_code(index: dict[str, Any], products_by_id: dict[str, dict[str, Any]], code: str) -> dict[str, Any] | None:
+    """Reference lookup: the variant for ``code``, given the products it points into."""
+    entry = index["codes"].get(code)
+    if entry is None:
+        return None
+    product_id, size_index, variant_index = entry
+    return products_by_id[product_id]["sizes"][size_index]["variants"][variant_index]
@@ -0,0 +1,142 @@
+"""
+Record types for catalog rows and the products built from them.
+
+Rows, variants, sizes and products are slotted dataclasses: no per-instance
+dict, and attribute access instead of string-keyed lookups while grouping.
+They become JSON only at the output edge, through ``to_json``, which keeps
+the field order of the generated files::
+
+    CatalogRow  -> {"group_root", "family_indicator", "group_code", "title",
+                    "title_en_slug", "category", "size_code", "variant",
+                    "additional_images"}
+    Variant     -> {"code", "description", "color", "image_url", "pack", "excel_ar"}
+    Size        -> {"size_label", "size_code", "variants", "colors_count", "specs"}
+    Product     -> {"id", "family_indicator", "group_root", "title", "category",
+                    "representative_image", "sizes", "sizes_count",
+                    "variants_count"} (+ "subcategory" for split products)
+
+Variants are shared between a group's rows and its product, so code that
+changes a variant (dropping a dead packshot) replaces it with
+``dataclasses.replace`` instead of mutating it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class Variant:
+    code: str
+    description: str
+    color: str
+    image_url: str
+    pack: str
+    excel_ar: str
+
+    def to_json(self) -> dict[str, str]:
+        return {
+            "code": self.code,
+            "description": self.description,
+            "color": self.color,
+            "image_url": self.image_url,
+            "pack": self.pack,
+            "excel_ar": self.excel_ar,
+        }
+
+
+@dataclass(slots=True)
+class CatalogRow:
+    group_root: str
+    family_indicator: str
+    group_code: str
+    title: str
+    title_en_slug: str
+    category: str
+    size_code: str
+    variant: Variant
+    additional_images: list[str]
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "group_root": self.group_root,
+            "family_indicator": self.family_indicator,
+            "group_code": self.group_code,
+            "title": self.title,
+            "title_en_slug": self.title_en_slug,
+            "category": self.category,
+            "size_code": self.size_code,
+            "variant": self.variant.to_json(),
+            "additional_images": self.additional_images,
+        }
+
+    def as_tuple(self) -> tuple[Any, ...]:
+        """Field values in declaration order (the variant's as a nested tuple), for content hashing."""
+        variant = self.variant
+        return (
+            self.group_root,
+            self.family_indicator,
+            self.group_code,
+            self.title,
+            self.title_en_slug,
+            self.category,
+            self.size_code,
+            (variant.code, variant.description, variant.color, variant.image_url, variant.pack, variant.excel_ar),
+            self.additional_images,
+        )
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> CatalogRow:
+        return cls(
+            **{**data, "variant": Variant(**data["variant"]), "additional_images": list(data["additional_images"])}
+        )
+
+
+@dataclass(slots=True)
+class Size:
+    size_label: str
+    size_code: str
+    variants: list[Variant]
+    colors_count: int
+    specs: dict[str, Any]
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "size_label": self.size_label,
+            "size_code": self.size_code,
+            "variants": [variant.to_json() for variant in self.variants],
+            "colors_count": self.colors_count,
+            "specs": self.specs,
+        }
+
+
+@dataclass(slots=True)
+class Product:
+    id: str
+    family_indicator: str
+    group_root: str
+    title: str
+    category: str
+    representative_image: str
+    sizes: list[Size]
+    sizes_count: int
+    variants_count: int
+    # Only products split by a family grouping rule carry a subcategory.
+    subcategory: str = ""
+
+    def to_json(self) -> dict[str, Any]:
+        data = {
+            "id": self.id,
+            "family_indicator": self.family_indicator,
+            "group_root": self.group_root,
+            "title": self.title,
+            "category": self.category,
+            "representative_image": self.representative_image,
+            "sizes": [size.to_json() for size in self.sizes],
+            "sizes_count": self.sizes_count,
+            "variants_count": self.variants_count,
+        }
+        if self.subcategory:
+            data["subcategory"] = self.subcategory
+        return data
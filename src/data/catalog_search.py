@@ -0,0 +1,105 @@
+"""
+Inverted search index for the catalog.
+
+Text is folded by ``normalize_for_match`` (lowercase, accents removed),
+punctuation becomes a separator, and every remaining word is a token. Tokens
+are stored sorted, so a prefix query is a binary search for the first token
+starting with the prefix followed by a scan to the last one.
+
+Layout::
+
+    {
+      "format": "viomes-search-index/1",
+      "products": ["1090", ...],               # product ids
+      "variants": [["1090-78", 0], ...],       # [code, product index]
+      "tokens": ["0", "1090", "10lt", ...],    # sorted
+      "product_postings": [[0], ...],          # per token: product indexes
+      "variant_postings": [[0, 1], ...]        # per token: variant indexes
+    }
+
+Product postings come from the product id, title and English slug (column
+AP); variant postings from the code, description and color. Codes split into
+words like any text (``1090-78`` -> ``1090``, ``78``).
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Iterable
+
+SEARCH_INDEX_FORMAT = "viomes-search-index/1"
+SEPARATOR_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_for_match(value: str) -> str:
+    # Also used by generate_catalog_json.py to match category names.
+    normalized = unicodedata.normalize("NFD", value.lower())
+    return "".join(ch for ch in normalized if unicodedata.category(ch) != "Mn")
+
+
+def tokenize(value: Any) -> list[str]:
+    if value is None:
+        return []
+    return [token for token in SEPARATOR_PATTERN.split(normalize_for_match(str(value))) if token]
+
+
+def build_search_index(products: list[dict[str, Any]], slugs_by_code: dict[str, str]) -> dict[str, Any]:
+    """Index products (as in products-grouped.json); ``slugs_by_code`` maps variant code -> title_en_slug."""
+    product_postings: dict[str, set[int]] = {}
+    variant_postings: dict[str, set[int]] = {}
+    product_ids: list[str] = []
+    variants: list[list[Any]] = []
+
+    def add(postings: dict[str, set[int]], tokens: Iterable[str], ref: int) -> None:
+        for token in tokens:
+            postings.setdefault(token, set()).add(ref)
+
+    for product_index, product in enumerate(products):
+        product_ids.append(product["id"])
+        product_tokens = tokenize(product["id"]) + tokenize(product["title"])
+        for size in product["sizes"]:
+            for variant in size["variants"]:
+                code = variant["code"]
+                product_tokens += tokenize(slugs_by_code.get(code))
+                variant_index = len(variants)
+                variants.append([code, product_index])
+                variant_tokens = tokenize(code) + tokenize(variant["description"]) + tokenize(variant["color"])
+                add(variant_postings, variant_tokens, variant_index)
+        add(product_postings, product_tokens, product_index)
+
+    tokens = sorted(product_postings.keys() | variant_postings.keys())
+    return {
+        "format": SEARCH_INDEX_FORMAT,
+        "products": product_ids,
+        "variants": variants,
+        "tokens": tokens,
+        "product_postings": [sorted(product_postings.get(token, ())) for token in tokens],
+        "variant_postings": [sorted(variant_postings.get(token, ())) for token in tokens],
+    }
+
+
+def prefix_range(tokens: list[str], prefix: str) -> range:
+    start = bisect_left(tokens, prefix)
+    end = start
+    while end < len(tokens) and tokens[end].startswith(prefix):
+        end += 1
+    return range(start, end)
+
+
+def search_index(index: dict[str, Any], query: str) -> list[str]:
+    """Reference lookup: ids of products where every query word prefixes some token.
+
+    A word matches a product through its own tokens or any of its variants'.
+    """
+    matches: set[int] | None = None
+    for word in tokenize(query):
+        word_matches: set[int] = set()
+        for position in prefix_range(index["tokens"], word):
+            word_matches.update(index["product_postings"][position])
+            word_matches.update(index["variants"][ref][1] for ref in index["variant_postings"][position])
+        matches = word_matches if matches is None else matches & word_matches
+        if not matches:
+            break
+    return [index["products"][ref] for ref in sorted(matches or ())]
@@ -0,0 +1,125 @@
+"""
+Spec extraction for catalog descriptions.
+
+Pulls liters, box dimensions (W x D x H), diameter and height out of free-text
+descriptions such as ``"ΚΑΣΠΩ LINEA 7lt-d25x21h cm-ΜΟΛΥΒΙ"``. Patterns are
+compiled once at import and results are memoized per normalized description,
+since every size of a product repeats the same text across its colors.
+
+``specs-golden.json`` holds the expected output for every description in the
+SITE workbook; ``test_catalog_specs.py`` and ``bench_catalog_json.py specs``
+check it.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any
+
+SPEC_FIELDS = ("liters", "width", "depth", "box_height", "diameter", "height")
+
+LITERS_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:lt|l)\b", flags=re.IGNORECASE)
+BOX_3D_PATTERN = re.compile(
+    r"(\d+(?:[.,]\d+)?)\s*x\s*(\d+(?:[.,]\d+)?)\s*x\s*(\d+(?:[.,]\d+)?)(?:\s*h)?",
+    flags=re.IGNORECASE,
+)
+# 2D sizes like stickers: 8,5x33 cm (no depth)
+BOX_2D_PATTERN = re.compile(
+    r"(\d+(?:[.,]\d+)?)\s*x\s*(\d+(?:[.,]\d+)?)(?:\s*(?:cm|χιλ|mm)\b|\b)",
+    flags=re.IGNORECASE,
+)
+DIAMETER_PATTERN = re.compile(
+    r"(?:^|[^a-z0-9])d\s*([0-9]+(?:[.,][0-9]+)?)\s*x\s*([0-9]+(?:[.,][0-9]+)?)\s*h?",
+    flags=re.IGNORECASE,
+)
+DIAMETER_SYMBOL_PATTERN = re.compile(
+    r"ø\s*([0-9]+(?:[.,][0-9]+)?)\s*x\s*h?\s*([0-9]+(?:[.,][0-9]+)?)",
+    flags=re.IGNORECASE,
+)
+
+# Distinct descriptions in the SITE workbook are in the low thousands; the
+# bound only matters for synthetic or much larger workbooks.
+SPEC_CACHE_SIZE = 16384
+
+
+def normalize_description(value: Any) -> str:
+    if value is None:
+        return ""
+    text = str(value).strip()
+    if text.lower() == "nan":
+        return ""
+    return text.lower()
+
+
+def number(match: re.Match[str] | None, group: int) -> str | None:
+    return match.group(group).replace(",", ".") if match else None
+
+
+@lru_cache(maxsize=SPEC_CACHE_SIZE)
+def parse_normalized_specs(normalized: str) -> tuple[str | None, ...]:
+    """Spec values in SPEC_FIELDS order for an already normalized description."""
+    if not normalized:
+        return (None,) * len(SPEC_FIELDS)
+
+    liters_match = LITERS_PATTERN.search(normalized)
+    box_3d_match = BOX_3D_PATTERN.search(normalized)
+    box_2d_match = None if box_3d_match else BOX_2D_PATTERN.search(normalized)
+    dimensions_match = DIAMETER_PATTERN.search(normalized) or DIAMETER_SYMBOL_PATTERN.search(normalized)
+
+    liters = number(liters_match, 1)
+    explicit_diameter = number(dimensions_match, 1)
+    explicit_height = number(dimensions_match, 2)
+
+    box_width = number(box_3d_match, 1)
+    box_depth = number(box_3d_match, 2)
+    box_height = number(box_3d_match, 3)
+
+    # If diameter syntax exists (d..x..h or ø..x..), do not treat it as width-height.
+    if explicit_diameter:
+        box_2d_match = None
+
+    # Some records encode round products as 8x16x16h; normalize to Ø8 x H16.
+    looks_like_round_duplicate = (
+        not explicit_diameter
+        and box_width
+        and box_depth
+        and box_height
+        and box_depth == box_height
+    )
+
+    width = None
+    depth = None
+    height = explicit_height
+    parsed_box_height = None
+    diameter = explicit_diameter
+
+    if looks_like_round_duplicate:
+        diameter = explicit_diameter or box_width
+        height = explicit_height or box_depth
+    elif box_3d_match:
+        width = box_width
+        depth = box_depth
+        parsed_box_height = box_height
+    elif box_2d_match:
+        width = number(box_2d_match, 1)
+        # For flat/2D specs, treat second value as height so UI can display W x H.
+        height = number(box_2d_match, 2)
+
+    return (liters, width, depth, parsed_box_height, diameter, height)
+
+
+def specs_dict(values: tuple[str | None, ...]) -> dict[str, Any]:
+    specs: dict[str, Any] = dict(zip(SPEC_FIELDS, values))
+    specs["has_specs"] = any(values)
+    return specs
+
+
+def parse_specs_from_text(text: Any) -> dict[str, Any]:
+    # A fresh dict per call: callers embed it in the product and must not
+    # share it with other sizes.
+    return specs_dict(parse_normalized_specs(normalize_description(text)))
+
+
+def has_specs(text: Any) -> bool:
+    return any(parse_normalized_specs(normalize_description(text)))
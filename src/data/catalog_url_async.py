@@ -0,0 +1,528 @@
+"""
+asyncio URL checker with per-host keep-alive connection pooling.
+
+Each host gets a small pool of persistent HTTP/1.1 connections, so checking
+hundreds of images on the same host pays for one TCP+TLS handshake per pooled
+connection instead of one per URL. Concurrency is capped per host and
+adapted overall (AIMD): it grows while responses stay fast and is halved on
+timeouts, slow responses and throttling (429/503). ``Retry-After`` pauses the
+whole host before the request is retried; other transient failures (network
+errors, 502/504) are retried with jittered exponential backoff.
+
+Results use the same shape as generate_catalog_json.probe_url:
+``{"status", "reachable", "etag", "last_modified"}``. A request that is still
+throttled or failing after its retries keeps its last status (429/503/5xx or
+None), which the generator treats as "unverified", not as "gone". A URL that
+cannot be requested at all (see request_url) gets status 0: it is gone.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import ssl
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable
+from urllib.parse import quote, urljoin, urlsplit, urlunsplit
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+THROTTLE_STATUSES = (429, 503)
+RETRYABLE_STATUSES = (502, 504)
+MAX_REDIRECTS = 5
+
+# A response slower than both of these (relative to the fastest one seen) is
+# treated as a congestion signal.
+SLOW_RESPONSE_FACTOR = 3.0
+SLOW_RESPONSE_MARGIN_SECONDS = 0.25
+
+
+def request_url(url: str) -> str | None:
+    """``url`` as it goes on the wire, or None if it is not a usable http(s) URL.
+
+    Spaces and non-ASCII characters in the path and query are percent-encoded
+    (existing escapes are kept) and the host is IDNA-encoded, so both URL
+    backends send the same request for the same workbook value.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        # Reading the port raises ValueError when it is malformed.
+        parts.port
+        netloc = parts.netloc.encode("idna").decode("ascii")
+    except (ValueError, UnicodeError):
+        return None
+    if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+        return None
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            netloc,
+            quote(parts.path, safe="/%") or "/",
+            quote(parts.query, safe="/%=&?:+,;"),
+            "",
+        )
+    )
+
+
+def unusable_url_result() -> dict[str, Any]:
+    # Status 0 is definitive: no request can ever reach this image.
+    return {"status": 0, "reachable": False, "etag": "", "last_modified": ""}
+
+
+class StaleConnectionError(ConnectionError):
+    """A pooled keep-alive connection was closed by the server before replying."""
+
+
+class HostPool:
+    def __init__(self, limit: int) -> None:
+        self.slots = asyncio.Semaphore(limit)
+        self.idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        # Event-loop time before which no request may be sent (Retry-After).
+        self.blocked_until = 0.0
+
+
+class AdaptiveLimiter:
+    """AIMD limit on in-flight requests.
+
+    Starts small and grows by one per success (doubling every round trip)
+    until the first congestion signal, then by ``1 / limit`` per success. A
+    congestion signal halves the limit, at most once per cooldown so one
+    burst of failures does not collapse it to the floor.
+    """
+
+    def __init__(self, ceiling: int, initial: int = 4) -> None:
+        self.ceiling = max(1, ceiling)
+        self.limit = float(min(self.ceiling, max(1, initial)))
+        self.in_flight = 0
+        self.slow_start = True
+        self.fastest_seconds: float | None = None
+        self.last_decrease = 0.0
+        self.cooldown_seconds = 0.5
+        # FIFO of tasks waiting for a slot; slots are handed over directly so
+        # a release wakes exactly one waiter.
+        self.waiters: deque[asyncio.Future[None]] = deque()
+        # Lowest and highest limit reached, for the run summary.
+        self.min_limit = self.limit
+        self.max_limit = self.limit
+
+    async def __aenter__(self) -> None:
+        if not self.waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation.
+                self.release()
+            raise
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self.wake_waiters()
+
+    def wake_waiters(self) -> None:
+        while self.waiters and self.in_flight < int(self.limit):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def on_success(self, elapsed_seconds: float) -> None:
+        if self.fastest_seconds is None or elapsed_seconds < self.fastest_seconds:
+            self.fastest_seconds = elapsed_seconds
+        threshold = max(
+            self.fastest_seconds * SLOW_RESPONSE_FACTOR,
+            self.fastest_seconds + SLOW_RESPONSE_MARGIN_SECONDS,
+        )
+        if elapsed_seconds > threshold:
+            self.on_congestion()
+            return
+        step = 1.0 if self.slow_start else 1.0 / self.limit
+        self.limit = min(float(self.ceiling), self.limit + step)
+        self.max_limit = max(self.max_limit, self.limit)
+        self.wake_waiters()
+
+    def on_congestion(self) -> None:
+        self.slow_start = False
+        now = time.monotonic()
+        if now - self.last_decrease < self.cooldown_seconds:
+            return
+        self.last_decrease = now
+        self.limit = max(1.0, self.limit / 2)
+        self.min_limit = min(self.min_limit, self.limit)
+
+
+def parse_retry_after(value: str) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    value = value.strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class AsyncUrlChecker:
+    def __init__(
+        self,
+        timeout_seconds: float,
+        max_concurrency: int,
+        per_host: int,
+        retries: int,
+        user_agent: str,
+        backoff_seconds: float = 0.25,
+        throttle_retries: int = 8,
+        max_retry_after_seconds: float = 60.0,
+    ) -> None:
+        self.timeout_seconds = timeout_seconds
+        self.per_host = max(1, per_host)
+        self.retries = max(0, retries)
+        self.user_agent = user_agent
+        self.backoff_seconds = backoff_seconds
+        self.throttle_retries = max(0, throttle_retries)
+        self.max_retry_after_seconds = max_retry_after_seconds
+        self.limiter = AdaptiveLimiter(max_concurrency)
+        self.pools: dict[tuple[str, str, int], HostPool] = {}
+        self.ssl_context = ssl.create_default_context()
+        # Counters for benchmarks and the run summary.
+        self.connections_opened = 0
+        self.retried = 0
+        self.throttled = 0
+
+    async def probe(self, url: str, etag: str = "", last_modified: str = "") -> dict[str, Any]:
+        result: dict[str, Any] = {"status": None, "reachable": False, "etag": "", "last_modified": ""}
+        url = request_url(url) if url else None
+        if url is None:
+            return unusable_url_result()
+
+        headers = {"User-Agent": self.user_agent}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        for method in ("HEAD", "GET"):
+            status, response_headers = await self.request_with_retries(method, url, headers)
+            if status is None:
+                return result
+            # Some servers reject HEAD even if GET would work.
+            if method == "HEAD" and status in (405, 501):
+                continue
+            if status == 304:
+                # Unchanged since the validators were issued.
+                result.update(
+                    status=304,
+                    reachable=True,
+                    etag=response_headers.get("etag") or etag,
+                    last_modified=response_headers.get("last-modified") or last_modified,
+                )
+                return result
+            result.update(
+                status=status,
+                reachable=200 <= status < 400,
+                etag=response_headers.get("etag", ""),
+                last_modified=response_headers.get("last-modified", ""),
+            )
+            return result
+        return result
+
+    def pool_for(self, url: str) -> HostPool:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == "https" else 80)
+        return self.pools.setdefault((scheme, parts.hostname or "", port), HostPool(self.per_host))
+
+    async def request_with_retries(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+    ) -> tuple[int | None, dict[str, str]]:
+        loop = asyncio.get_running_loop()
+        pool = self.pool_for(url)
+        status: int | None = None
+        response_headers: dict[str, str] = {}
+        attempt = 0
+        throttle_attempt = 0
+        while True:
+            wait_seconds = pool.blocked_until - loop.time()
+            if wait_seconds > 0:
+                await asyncio.sleep(wait_seconds)
+
+            async with self.limiter:
+                started = loop.time()
+                try:
+                    status, response_headers = await asyncio.wait_for(
+                        self.follow_redirects(method, url, headers),
+                        timeout=self.timeout_seconds,
+                    )
+                except (OSError, asyncio.TimeoutError, ValueError) as exc:
+                    status, response_headers = None, {}
+                    if isinstance(exc, asyncio.TimeoutError):
+                        self.limiter.on_congestion()
+                elapsed = loop.time() - started
+
+            if status in THROTTLE_STATUSES:
+                # The host is pushing back, which says nothing about the image.
+                self.throttled += 1
+                self.limiter.on_congestion()
+                if throttle_attempt >= self.throttle_retries:
+                    return status, response_headers
+                retry_after = parse_retry_after(response_headers.get("retry-after", ""))
+                if retry_after is None:
+                    retry_after = self.backoff_delay(throttle_attempt + 1)
+                elif retry_after > self.max_retry_after_seconds:
+                    return status, response_headers
+                throttle_attempt += 1
+                self.retried += 1
+                pool.blocked_until = max(pool.blocked_until, loop.time() + retry_after)
+                continue
+
+            if status is not None and status not in RETRYABLE_STATUSES:
+                self.limiter.on_success(elapsed)
+                return status, response_headers
+
+            if attempt >= self.retries:
+                return status, response_headers
+            attempt += 1
+            self.retried += 1
+            await asyncio.sleep(self.backoff_delay(attempt))
+
+    def backoff_delay(self, attempt: int) -> float:
+        return self.backoff_seconds * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+    async def follow_redirects(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+    ) -> tuple[int, dict[str, str]]:
+        # urlopen follows redirects and reports the final status; do the same.
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers = await self.request(method, url, headers)
+            location = response_headers.get("location")
+            if status not in REDIRECT_STATUSES or not location:
+                return status, response_headers
+            redirect_url = request_url(urljoin(url, location))
+            if redirect_url is None:
+                # Redirected somewhere no request can follow.
+                return 0, {}
+            url = redirect_url
+        return status, response_headers
+
+    async def request(self, method: str, url: str, headers: dict[str, str]) -> tuple[int, dict[str, str]]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        pool = self.pool_for(url)
+
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        host_header = host if parts.port is None else f"{host}:{parts.port}"
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host_header}", "Accept: */*"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        async with pool.slots:
+            while pool.idle:
+                reader, writer = pool.idle.pop()
+                try:
+                    return await self.exchange(pool, reader, writer, method, payload)
+                except StaleConnectionError:
+                    # The server dropped an idle connection; try the next one.
+                    continue
+            reader, writer = await asyncio.open_connection(
+                host,
+                port,
+                ssl=self.ssl_context if scheme == "https" else None,
+            )
+            self.connections_opened += 1
+            return await self.exchange(pool, reader, writer, method, payload)
+
+    async def exchange(
+        self,
+        pool: HostPool,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        method: str,
+        payload: bytes,
+    ) -> tuple[int, dict[str, str]]:
+        reusable = False
+        try:
+            writer.write(payload)
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise StaleConnectionError("connection closed before the status line")
+            version, status_text = status_line.decode("latin-1").split(" ", 2)[:2]
+            status = int(status_text)
+
+            response_headers: dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+
+            # HEAD, 304 and 1xx/204 responses never carry a body, so the
+            # connection can be reused right away. GET bodies (images) are not
+            # worth downloading: the connection is closed instead.
+            no_body = method == "HEAD" or status in (204, 304) or 100 <= status < 200
+            reusable = (
+                no_body
+                and version == "HTTP/1.1"
+                and response_headers.get("connection", "").lower() != "close"
+            )
+            return status, response_headers
+        except (ConnectionResetError, BrokenPipeError) as exc:
+            raise StaleConnectionError(str(exc)) from exc
+        finally:
+            if reusable:
+                pool.idle.append((reader, writer))
+            else:
+                writer.close()
+
+    async def close(self) -> None:
+        for pool in self.pools.values():
+            while pool.idle:
+                _, writer = pool.idle.pop()
+                writer.close()
+
+
+async def probe_all(
+    jobs: dict[str, tuple[str, str]],
+    checker_options: dict[str, Any],
+    deadline_seconds: float | None = None,
+) -> tuple[dict[str, dict[str, Any]], AsyncUrlChecker]:
+    checker = AsyncUrlChecker(**checker_options)
+    # Tasks are created in job order and the limiter serves waiters FIFO, so
+    # jobs start in the order given.
+    tasks = {asyncio.ensure_future(checker.probe(url, *validators)): url for url, validators in jobs.items()}
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=deadline_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    finally:
+        await checker.close()
+    # URLs that were not finished before the deadline have no result.
+    return {tasks[task]: task.result() for task in done}, checker
+
+
+async def probe_queued(
+    next_urls: Callable[[], tuple[list[str], bool]],
+    plan: Callable[[list[str]], dict[str, tuple[str, str]]],
+    checker_options: dict[str, Any],
+    deadline_seconds: float | None = None,
+    abort: threading.Event | None = None,
+) -> tuple[dict[str, dict[str, Any]], AsyncUrlChecker]:
+    """Probe URLs as they are handed over, all on one checker.
+
+    ``next_urls`` blocks until more URLs are queued and returns them with
+    whether the queue is closed; it runs on a daemon thread, so a queue that
+    is never closed cannot keep the process alive. ``plan`` maps a batch to
+    the ``url -> (etag, last_modified)`` jobs that need a request. Keep-alive
+    connections and the concurrency limit carry over from one hand-over to
+    the next. At the deadline, or once the queue is closed with ``abort``
+    set, running probes are cancelled and no new ones start; those URLs have
+    no result.
+    """
+    loop = asyncio.get_running_loop()
+    checker = AsyncUrlChecker(**checker_options)
+    batches: asyncio.Queue[tuple[list[str], bool]] = asyncio.Queue()
+    tasks: dict[asyncio.Future[dict[str, Any]], str] = {}
+    expired = False
+
+    def feed() -> None:
+        finished = False
+        while not finished:
+            urls, finished = next_urls()
+            try:
+                loop.call_soon_threadsafe(batches.put_nowait, (urls, finished))
+            except RuntimeError:
+                # The loop is already gone.
+                return
+
+    def expire() -> None:
+        nonlocal expired
+        expired = True
+        for task in tasks:
+            task.cancel()
+
+    threading.Thread(target=feed, name="url-intake", daemon=True).start()
+    timer = loop.call_later(deadline_seconds, expire) if deadline_seconds is not None else None
+    try:
+        finished = False
+        while not finished:
+            urls, finished = await batches.get()
+            for url, validators in plan(urls).items():
+                if not expired:
+                    tasks[asyncio.ensure_future(checker.probe(url, *validators))] = url
+        if abort is not None and abort.is_set():
+            expire()
+        if tasks:
+            await asyncio.wait(tasks)
+    finally:
+        if timer:
+            timer.cancel()
+        for task in tasks:
+            task.cancel()
+        await checker.close()
+    return {url: task.result() for task, url in tasks.items() if not task.cancelled()}, checker
+
+
+def add_checker_stats(checker: AsyncUrlChecker, stats: dict[str, Any]) -> None:
+    stats["connections"] = stats.get("connections", 0) + checker.connections_opened
+    stats["retried"] = stats.get("retried", 0) + checker.retried
+    stats["throttled"] = stats.get("throttled", 0) + checker.throttled
+    stats["concurrency_min"] = int(checker.limiter.min_limit)
+    stats["concurrency_max"] = int(checker.limiter.max_limit)
+
+
+def probe_urls_async(
+    jobs: dict[str, tuple[str, str]],
+    timeout_seconds: float,
+    max_concurrency: int,
+    per_host: int,
+    retries: int,
+    user_agent: str,
+    stats: dict[str, Any] | None = None,
+    deadline_seconds: float | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Probe ``url -> (etag, last_modified)`` jobs concurrently; returns url -> result.
+
+    With ``deadline_seconds``, jobs still running at the deadline are
+    cancelled and left out of the result.
+    """
+    results, checker = asyncio.run(
+        probe_all(
+            jobs,
+            {
+                "timeout_seconds": timeout_seconds,
+                "max_concurrency": max_concurrency,
+                "per_host": per_host,
+                "retries": retries,
+                "user_agent": user_agent,
+            },
+            deadline_seconds=deadline_seconds,
+        )
+    )
+    if stats is not None:
+        add_checker_stats(checker, stats)
+    return results
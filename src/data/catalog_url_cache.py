@@ -0,0 +1,105 @@
+"""
+Persistent URL reachability cache for the catalog generator.
+
+Stores the last HTTP status, ETag, Last-Modified and check time per URL in a
+small SQLite database (default ``.cache/url-status.sqlite3``). Entries younger
+than the TTL are trusted as-is; older reachable entries are revalidated with
+``If-None-Match`` / ``If-Modified-Since`` so most rechecks are cheap 304s. The
+first time each URL was seen is kept too, so a deadline-bounded run can check
+the newest URLs first. Only definitive answers are stored (callers skip
+throttling, server errors and network failures), so a flaky run cannot pin a
+URL as dead.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+
+class UrlStatusCache:
+    def __init__(self, path: Path, ttl_seconds: float) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS url_status (
+                url TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                reachable INTEGER NOT NULL,
+                etag TEXT NOT NULL DEFAULT '',
+                last_modified TEXT NOT NULL DEFAULT '',
+                checked_at REAL NOT NULL
+            )
+            """
+        )
+        # When each URL first showed up in the catalog, so a time-boxed run
+        # can check the newest URLs first.
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS url_seen (
+                url TEXT PRIMARY KEY,
+                first_seen REAL NOT NULL
+            )
+            """
+        )
+
+    def mark_seen(self, urls: list[str], seen_at: float | None = None) -> None:
+        seen_at = time.time() if seen_at is None else seen_at
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO url_seen (url, first_seen) VALUES (?, ?)",
+            [(url, seen_at) for url in urls],
+        )
+
+    def first_seen(self, url: str) -> float | None:
+        row = self.connection.execute("SELECT first_seen FROM url_seen WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        row = self.connection.execute(
+            "SELECT status, reachable, etag, last_modified, checked_at FROM url_status WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        status, reachable, etag, last_modified, checked_at = row
+        return {
+            "status": status,
+            "reachable": bool(reachable),
+            "etag": etag,
+            "last_modified": last_modified,
+            "checked_at": checked_at,
+        }
+
+    def is_fresh(self, entry: dict[str, Any], now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        return now - entry["checked_at"] < self.ttl_seconds
+
+    def put(self, url: str, result: dict[str, Any], checked_at: float | None = None) -> None:
+        if result["status"] is None:
+            return
+        self.connection.execute(
+            """
+            INSERT OR REPLACE INTO url_status (url, status, reachable, etag, last_modified, checked_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                url,
+                result["status"],
+                int(result["reachable"]),
+                result.get("etag") or "",
+                result.get("last_modified") or "",
+                time.time() if checked_at is None else checked_at,
+            ),
+        )
+
+    def commit(self) -> None:
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.commit()
+        self.connection.close()
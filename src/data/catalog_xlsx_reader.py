@@ -0,0 +1,228 @@
+"""
+Minimal .xlsx reader for the catalog generator.
+
+Reads the worksheet XML, shared strings and styles straight from the zip and
+yields only the requested columns, without building the openpyxl object model.
+Cell values are converted the way openpyxl does with ``data_only=True``
+(shared/inline strings, ints vs floats, booleans, cached formula results), so
+both engines feed identical values into the generator.
+
+Date-formatted numeric cells are returned as their raw serial numbers; none of
+the catalog columns hold dates.
+"""
+
+from __future__ import annotations
+
+import posixpath
+import zipfile
+from pathlib import Path
+from typing import Any, Iterator
+from xml.etree.ElementTree import iterparse, parse
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+ROW_TAG = f"{MAIN_NS}row"
+CELL_TAG = f"{MAIN_NS}c"
+VALUE_TAG = f"{MAIN_NS}v"
+INLINE_STRING_TAG = f"{MAIN_NS}is"
+TEXT_TAG = f"{MAIN_NS}t"
+RUN_TAG = f"{MAIN_NS}r"
+SHEET_DATA_TAG = f"{MAIN_NS}sheetData"
+
+FIRST_DATA_ROW = 3
+
+
+def column_index(reference: str) -> int:
+    """Zero-based column index of a cell reference such as ``"BA12"``."""
+    index = 0
+    for char in reference:
+        if "A" <= char <= "Z":
+            index = index * 26 + (ord(char) - 64)
+        else:
+            break
+    return index - 1
+
+
+def read_text_content(element: Any) -> str:
+    # Mirrors openpyxl's Text.content: the plain <t> plus every rich-text run,
+    # skipping phonetic (<rPh>) blocks.
+    snippets = []
+    plain = element.find(TEXT_TAG)
+    if plain is not None and plain.text is not None:
+        snippets.append(plain.text)
+    for run in element.findall(RUN_TAG):
+        text = run.find(TEXT_TAG)
+        if text is not None and text.text is not None:
+            snippets.append(text.text)
+    return "".join(snippets)
+
+
+def read_relationships(archive: zipfile.ZipFile, rels_path: str, base_dir: str) -> dict[str, tuple[str, str]]:
+    """Map relationship id -> (type suffix, archive path)."""
+    if rels_path not in archive.namelist():
+        return {}
+    with archive.open(rels_path) as handle:
+        root = parse(handle).getroot()
+
+    relationships: dict[str, tuple[str, str]] = {}
+    for rel in root.iter(f"{PACKAGE_REL_NS}Relationship"):
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            path = target.lstrip("/")
+        else:
+            path = posixpath.normpath(posixpath.join(base_dir, target))
+        rel_type = rel.get("Type", "").rsplit("/", 1)[-1]
+        relationships[rel.get("Id", "")] = (rel_type, path)
+    return relationships
+
+
+def resolve_part_paths(archive: zipfile.ZipFile, sheet: str | None) -> tuple[str, str | None, str | None]:
+    """Return the archive paths of the worksheet, shared strings and styles parts."""
+    relationships = read_relationships(archive, "xl/_rels/workbook.xml.rels", "xl")
+
+    with archive.open("xl/workbook.xml") as handle:
+        workbook_root = parse(handle).getroot()
+    sheets = [
+        (node.get("name"), node.get(f"{REL_NS}id"))
+        for node in workbook_root.iter(f"{MAIN_NS}sheet")
+    ]
+    if not sheets:
+        raise ValueError("Workbook has no sheets")
+
+    if sheet is None:
+        sheet_rel_id = sheets[0][1]
+    else:
+        matches = [rel_id for name, rel_id in sheets if name == sheet]
+        if not matches:
+            raise KeyError(f"Worksheet {sheet} does not exist.")
+        sheet_rel_id = matches[0]
+
+    sheet_path = relationships.get(sheet_rel_id or "", ("", "xl/worksheets/sheet1.xml"))[1]
+    parts_by_type = {rel_type: path for rel_type, path in relationships.values()}
+    return sheet_path, parts_by_type.get("sharedStrings"), parts_by_type.get("styles")
+
+
+def read_shared_strings(archive: zipfile.ZipFile, path: str | None) -> list[str]:
+    if not path or path not in archive.namelist():
+        return []
+
+    strings: list[str] = []
+    with archive.open(path) as handle:
+        for _, node in iterparse(handle):
+            if node.tag == f"{MAIN_NS}si":
+                # openpyxl strips the escaped-underscore marker the same way.
+                strings.append(read_text_content(node).replace("x005F_", ""))
+                node.clear()
+    return strings
+
+
+def read_fill_styles(archive: zipfile.ZipFile, path: str | None, fill_hex_suffix: str) -> list[bool]:
+    """Return a style-index -> "has a solid fill ending in fill_hex_suffix" table from cellXfs/fills."""
+    if not path or path not in archive.namelist():
+        return []
+    with archive.open(path) as handle:
+        root = parse(handle).getroot()
+
+    matching_fills: list[bool] = []
+    fills = root.find(f"{MAIN_NS}fills")
+    for fill in fills if fills is not None else []:
+        pattern = fill.find(f"{MAIN_NS}patternFill")
+        matches = False
+        if pattern is not None and pattern.get("patternType") == "solid":
+            fg_color = pattern.find(f"{MAIN_NS}fgColor")
+            # openpyxl only reports an rgb color when no indexed/theme/auto
+            # attribute is present.
+            if fg_color is not None and not any(
+                fg_color.get(attr) is not None for attr in ("indexed", "theme", "auto")
+            ):
+                matches = fg_color.get("rgb", "").upper().endswith(fill_hex_suffix)
+        matching_fills.append(matches)
+
+    matching_styles: list[bool] = []
+    cell_xfs = root.find(f"{MAIN_NS}cellXfs")
+    for xf in cell_xfs if cell_xfs is not None else []:
+        fill_id = int(xf.get("fillId", 0))
+        matching_styles.append(fill_id < len(matching_fills) and matching_fills[fill_id])
+    return matching_styles
+
+
+def convert_cell(cell: Any, shared_strings: list[str]) -> Any:
+    data_type = cell.get("t", "n")
+    if data_type == "inlineStr":
+        inline = cell.find(INLINE_STRING_TAG)
+        return read_text_content(inline) if inline is not None else None
+
+    value = cell.findtext(VALUE_TAG) or None
+    if value is None:
+        return None
+    if data_type == "n":
+        if "." in value or "E" in value or "e" in value:
+            return float(value)
+        return int(value)
+    if data_type == "s":
+        return shared_strings[int(value)]
+    if data_type == "b":
+        return bool(int(value))
+    # "str" (cached formula text), "e" (error) and "d" (ISO date) stay as text.
+    return value
+
+
+def iter_xlsx_records(
+    xlsx_path: Path,
+    sheet: str | None,
+    columns: tuple[int, ...],
+    flag_column: int,
+    fill_hex_suffix: str,
+) -> Iterator[tuple[Any, ...]]:
+    """Yield ``(*values of columns, flag_column has the fill)`` for every sheet row from row 3.
+
+    Rows are parsed incrementally and discarded once yielded, so memory is
+    bounded by the shared-string table rather than the sheet size. Rows that
+    are missing from the XML are skipped; they carry no values.
+    """
+    position_by_column = {column: position for position, column in enumerate(columns)}
+    max_column = max(columns + (flag_column,))
+    empty_record = (None,) * len(columns)
+
+    with zipfile.ZipFile(xlsx_path) as archive:
+        sheet_path, strings_path, styles_path = resolve_part_paths(archive, sheet)
+        shared_strings = read_shared_strings(archive, strings_path)
+        fill_styles = read_fill_styles(archive, styles_path, fill_hex_suffix.upper())
+
+        with archive.open(sheet_path) as handle:
+            sheet_data = None
+            row_number = 0
+            for event, element in iterparse(handle, events=("start", "end")):
+                if event == "start":
+                    if element.tag == SHEET_DATA_TAG:
+                        sheet_data = element
+                    continue
+                if element.tag != ROW_TAG:
+                    continue
+
+                row_ref = element.get("r")
+                row_number = int(row_ref) if row_ref else row_number + 1
+                if row_number >= FIRST_DATA_ROW:
+                    values = list(empty_record)
+                    has_fill = False
+                    column = -1
+                    for cell in element.iter(CELL_TAG):
+                        reference = cell.get("r")
+                        column = column_index(reference) if reference else column + 1
+                        if column > max_column:
+                            break
+                        if column == flag_column:
+                            style_id = int(cell.get("s", 0))
+                            has_fill = style_id < len(fill_styles) and fill_styles[style_id]
+                        position = position_by_column.get(column)
+                        if position is not None:
+                            values[position] = convert_cell(cell, shared_strings)
+                    yield (*values, has_fill)
+
+                # Finished rows are detached so the parsed tree never grows.
+                if sheet_data is not None:
+                    sheet_data.clear()
+                else:
+                    element.clear()
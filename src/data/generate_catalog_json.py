@@ -3,29 +3,69 @@
 Generate:
   - products-grouped.json
   - additional-images.json
+  - optionally, a sharded catalog (manifest.json + products/<id>.json)
+  - optionally, a compact string-table encoding of products-grouped.json
+  - optionally, an accent-folded search index
+  - optionally, a facet and numeric-range index
+  - optionally, a variant-code lookup index
+  - optionally, additional images as shared galleries (each distinct list once)
+  - optionally, paginated per-category listing pages with card fields only
+  - optionally, minified content-hashed copies with .gz/.br sidecars and a
+    catalog-version.json pointer
 
 from the VIOMES Excel catalog workbook.
 
 Usage:
   python src/data/generate_catalog_json.py
   python src/data/generate_catalog_json.py --xlsx "src/data/ΚΑΤΑΣΤΑΣΗ ΕΙΔΩΝ ΚΑΙ ΠΕΡΙΓΡΑΦΕΣ SITE.xlsx"
+  python src/data/generate_catalog_json.py --shards-out public/data/catalog
+  python src/data/generate_catalog_json.py --watch --skip-url-validation
+  python src/data/generate_catalog_json.py diff OLD.xlsx NEW.xlsx --out catalog-delta.json
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import gzip
+import hashlib
 import json
+import os
+import queue
 import re
+import sys
+import threading
+import time
 import unicodedata
 from collections import Counter, defaultdict
+from dataclasses import replace
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 from urllib.error import HTTPError, URLError
+from urllib.parse import quote
 from urllib.request import Request, urlopen
 
 import openpyxl
 
+try:
+    import brotli
+except ImportError:  # optional: only needed for .br sidecars
+    brotli = None
+
+from catalog_url_async import add_checker_stats, probe_queued, probe_urls_async, request_url, unusable_url_result
+from catalog_compact import encode_catalog
+from catalog_diff import DELTA_FORMAT, diff_rows, touched_groups
+from catalog_facets import build_facet_index
+from catalog_listings import FIRST_PAGE_SIZE, PAGE_SIZE, build_category_listings
+from catalog_lookup import build_code_index
+from catalog_profile import BuildProfile
+from catalog_records import CatalogRow, Product, Size, Variant
+from catalog_search import build_search_index, normalize_for_match
+from catalog_specs import has_specs, parse_specs_from_text
+from catalog_url_cache import UrlStatusCache
+from catalog_xlsx_reader import iter_xlsx_records
+
 
 # Zero-based column indices in the worksheet.
 COL_GROUP_MARKER = 22      # W
@@ -43,6 +83,34 @@ COL_LIFESTYLE_START = 52   # BA..BD
 COL_LIFESTYLE_END = 55
 GREEN_FILL_HEX_SUFFIX = "C6EFCE"
 
+# Column order of the records fed into iter_catalog_rows_from_records. Each
+# record is these cell values followed by the F green-fill flag.
+RECORD_COLUMNS = (
+    COL_GROUP_MARKER,
+    COL_FAMILY_MARKER,
+    COL_CODE,
+    COL_DESCRIPTION,
+    COL_COLOR,
+    COL_PACK,
+    COL_CATEGORY,
+    COL_TITLE_GR,
+    COL_TITLE_EN_SLUG,
+    COL_EXCEL_AR,
+    COL_PACKSHOT,
+    *range(COL_LIFESTYLE_START, COL_LIFESTYLE_END + 1),
+)
+ENGINES = ("openpyxl", "xml")
+# The rules the site applies at load time (src/lib/familyGroupingRules.ts).
+DEFAULT_GROUPING_RULES = Path("src/data/family-grouping-rules.json")
+BUILD_CACHE_VERSION = 4
+# Per-product fields copied into the sharded catalog's manifest.json.
+MANIFEST_FIELDS = ("id", "title", "category", "representative_image", "sizes_count", "variants_count")
+URL_CHECK_USER_AGENT = "viomes-catalog-json-generator/1.0"
+URL_BACKENDS = ("threads", "asyncio")
+# Closed groups --stream-groups holds back in case they resume further down;
+# the SITE workbook needs 14 to build every group in one pass.
+STREAM_GROUP_WINDOW = 16
+
 
 def clean(value: Any) -> str:
     if value is None:
@@ -81,11 +149,6 @@ def derive_title(title_value: Any, description_value: Any, code: str) -> str:
     return code
 
 
-def normalize_for_match(value: str) -> str:
-    normalized = unicodedata.normalize("NFD", value.lower())
-    return "".join(ch for ch in normalized if unicodedata.category(ch) != "Mn")
-
-
 def resolve_site_category_from_excel(category_value: str) -> str:
     normalized = normalize_for_match(clean(category_value))
     if "ειδη σπιτιου" in normalized:
@@ -108,16 +171,48 @@ def is_green_description_cell(cell: Any) -> bool:
     return rgb.endswith(GREEN_FILL_HEX_SUFFIX)
 
 
-def build_rows(worksheet: Any) -> list[dict[str, Any]]:
+def iter_openpyxl_records(worksheet: Any) -> Iterator[tuple[Any, ...]]:
+    """Yield RECORD_COLUMNS values plus the F green-fill flag for each openpyxl row.
+
+    Works with both regular and read-only (streaming) worksheets; read-only
+    worksheets pad short rows with empty cells up to ``max_col``.
+    """
+    for row in worksheet.iter_rows(min_row=3, max_col=COL_LIFESTYLE_END + 1, values_only=False):
+        # The fill lookup is only needed for rows that can become variants.
+        is_green = bool(clean(row[COL_CODE].value)) and is_green_description_cell(row[COL_DESCRIPTION])
+        yield (*(row[index].value for index in RECORD_COLUMNS), is_green)
+
+
+def iter_catalog_rows_from_records(
+    records: Iterable[tuple[Any, ...]],
+    stats: Counter[str] | None = None,
+) -> Iterator[CatalogRow]:
+    """Yield catalog rows; ``stats`` counts scanned records and why rows were dropped."""
     current_group = ""
     current_family = ""
     seen_codes: set[str] = set()
-    rows: list[dict[str, Any]] = []
-
-    for row in worksheet.iter_rows(min_row=3, max_col=COL_LIFESTYLE_END + 1, values_only=False):
-        marker_group = clean(row[COL_GROUP_MARKER].value)
-        marker_family = clean(row[COL_FAMILY_MARKER].value)
-        code = clean(row[COL_CODE].value)
+    stats = Counter() if stats is None else stats
+
+    for record in records:
+        stats["rows_scanned"] += 1
+        (
+            group_value,
+            family_value,
+            code_value,
+            description_value,
+            color_value,
+            pack_value,
+            category_value,
+            title_value,
+            en_slug_value,
+            excel_ar_value,
+            packshot_value,
+            *lifestyle_values,
+            description_is_green,
+        ) = record
+        marker_group = clean(group_value)
+        marker_family = clean(family_value)
+        code = clean(code_value)
 
         # Keep the latest marker context, whether marker values appear on
         # dedicated marker rows or directly on data rows.
@@ -129,283 +224,683 @@ def build_rows(worksheet: Any) -> list[dict[str, Any]]:
         # Marker-only rows carry context but no variant data.
         if not code:
             continue
-        if not is_green_description_cell(row[COL_DESCRIPTION]):
+        if not description_is_green:
+            stats["rows_not_green"] += 1
             continue
         if code in seen_codes:
+            stats["rows_duplicate"] += 1
             continue
         seen_codes.add(code)
+        stats["rows_kept"] += 1
 
-        title = derive_title(row[COL_TITLE_GR].value, row[COL_DESCRIPTION].value, code)
-        en_slug = clean(row[COL_TITLE_EN_SLUG].value)
+        title = derive_title(title_value, description_value, code)
+        en_slug = clean(en_slug_value)
         size_code = code.split("-", 1)[0] if "-" in code else code
-        packshot = clean(row[COL_PACKSHOT].value)
-        additional_images = [
-            clean(row[index].value)
-            for index in range(COL_LIFESTYLE_START, COL_LIFESTYLE_END + 1)
-            if clean(row[index].value)
-        ]
-
-        rows.append(
-            {
-                "group_root": current_group,
-                "family_indicator": current_family,
-                "group_code": extract_group_code(current_group, code),
-                "title": title,
-                "title_en_slug": en_slug,
-                "category": resolve_site_category_from_excel(clean(row[COL_CATEGORY].value)),
-                "size_code": size_code,
-                "variant": {
-                    "code": code,
-                    "description": clean(row[COL_DESCRIPTION].value),
-                    "color": clean(row[COL_COLOR].value),
-                    "image_url": packshot,
-                    "pack": clean(row[COL_PACK].value),
-                    "excel_ar": clean(row[COL_EXCEL_AR].value),
-                },
-                "additional_images": additional_images,
-            }
+        packshot = clean(packshot_value)
+        additional_images = [clean(value) for value in lifestyle_values if clean(value)]
+
+        yield CatalogRow(
+            group_root=current_group,
+            family_indicator=current_family,
+            group_code=extract_group_code(current_group, code),
+            title=title,
+            title_en_slug=en_slug,
+            category=resolve_site_category_from_excel(clean(category_value)),
+            size_code=size_code,
+            variant=Variant(
+                code=code,
+                description=clean(description_value),
+                color=clean(color_value),
+                image_url=packshot,
+                pack=clean(pack_value),
+                excel_ar=clean(excel_ar_value),
+            ),
+            additional_images=additional_images,
         )
 
-    return rows
 
+def iter_catalog_rows(worksheet: Any, stats: Counter[str] | None = None) -> Iterator[CatalogRow]:
+    """Yield catalog rows one at a time, in worksheet order."""
+    return iter_catalog_rows_from_records(iter_openpyxl_records(worksheet), stats)
+
+
+def build_rows(worksheet: Any) -> list[CatalogRow]:
+    return list(iter_catalog_rows(worksheet))
 
-def build_grouped_products(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
+
+def row_group_key(row: CatalogRow) -> str:
+    # Group strictly by the Excel W marker (group_root).
+    return row.group_root or row.group_code
+
+
+def group_rows_by_key(rows: Iterable[CatalogRow]) -> dict[str, list[CatalogRow]]:
+    grouped: dict[str, list[CatalogRow]] = defaultdict(list)
     for row in rows:
-        # Group strictly by the Excel W marker (group_root).
-        key = row["group_root"] or row["group_code"]
-        grouped[key].append(row)
+        grouped[row_group_key(row)].append(row)
+    return grouped
+
+
+def iter_ordered_groups(
+    rows: Iterable[CatalogRow],
+    reread_rows: Callable[[], Iterable[CatalogRow]],
+    window: int = STREAM_GROUP_WINDOW,
+    stats: Counter[str] | None = None,
+) -> Iterator[tuple[str, list[CatalogRow]]]:
+    """Yield (group key, rows) like ``group_rows_by_key`` while holding only a few groups.
+
+    The sheet is laid out group by group under its W markers, so a group is
+    normally complete once the key changes. Closed groups wait among the
+    ``window`` most recently closed ones, so a group that resumes a little
+    further down (several do in the SITE workbook) is still yielded whole.
+    A group that resumes after it was yielded is out of order: its later rows
+    are dropped, and once the pass ends its complete rows are collected from
+    ``reread_rows()`` and it is yielded again. Consumers must let the second
+    yield replace the first. ``stats`` counts those groups.
+    """
+    closed: dict[str, list[CatalogRow]] = {}
+    yielded: set[str] = set()
+    out_of_order: set[str] = set()
+    current_key: str | None = None
+    current_rows: list[CatalogRow] = []
 
-    products: list[dict[str, Any]] = []
+    for row in rows:
+        key = row_group_key(row)
+        if key != current_key:
+            if current_key is not None and current_key not in out_of_order:
+                closed[current_key] = current_rows
+            if key in yielded:
+                out_of_order.add(key)
+            current_key = key
+            current_rows = closed.pop(key, [])
+            while len(closed) > window:
+                oldest = next(iter(closed))
+                yielded.add(oldest)
+                yield oldest, closed.pop(oldest)
+        if key not in out_of_order:
+            current_rows.append(row)
+
+    if current_key is not None and current_key not in out_of_order:
+        closed[current_key] = current_rows
+    yield from closed.items()
+    closed.clear()
+
+    if stats is not None:
+        stats["groups_out_of_order"] += len(out_of_order)
+    if out_of_order:
+        yield from group_rows_by_key(row for row in reread_rows() if row_group_key(row) in out_of_order).items()
+
+
+def product_sort_key(product: Product) -> tuple[str, str, str]:
+    return (product.group_root, product.title, product.id)
+
+
+def pick_representative_image(sizes: list[Size]) -> str:
+    # First non-empty packshot found among variants.
+    for size in sizes:
+        for variant in size.variants:
+            image_url = clean(variant.image_url)
+            if image_url:
+                return image_url
+    return ""
+
+
+def load_grouping_rules(path: Path) -> dict[str, list[dict[str, Any]]]:
+    """Split rules by product id from family-grouping-rules.json (see src/lib/familyGroupingRules.ts)."""
+    rules = json.loads(path.read_text(encoding="utf-8"))
+    return {
+        group_root: rule["splits"]
+        for group_root, rule in rules.items()
+        if rule.get("type") == "split" and rule.get("splits")
+    }
+
+
+def split_grouped_product(product: Product, split_rules: dict[str, list[dict[str, Any]]]) -> list[Product]:
+    """Apply a family grouping split the same way catalogDataLoader.splitGroupedProduct does.
+
+    Each split becomes its own product holding the listed sizes (in rule
+    order), with the split's id, title and subcategory and recomputed
+    representative image and counts. Splits that match no size are dropped;
+    a product without a matching split is returned unchanged.
+    """
+    rules = split_rules.get(product.id)
+    if not rules:
+        return [product]
+
+    sizes_by_code = {str(size.size_code): size for size in product.sizes}
+    split_products = []
+    for rule in rules:
+        selected_sizes = [sizes_by_code[code] for code in rule["sizeCodes"] if code in sizes_by_code]
+        if not selected_sizes:
+            continue
+        split_products.append(
+            replace(
+                product,
+                id=rule["groupName"],
+                family_indicator=rule["groupName"],
+                title=rule.get("title") or product.title,
+                representative_image=pick_representative_image(selected_sizes) or product.representative_image,
+                sizes=selected_sizes,
+                sizes_count=len(selected_sizes),
+                variants_count=sum(len(size.variants) for size in selected_sizes),
+                subcategory=rule.get("subcategory") or product.subcategory,
+            )
+        )
+    return split_products or [product]
+
+
+def build_grouped_products(rows: list[CatalogRow]) -> list[Product]:
+    grouped = group_rows_by_key(rows)
+    products: list[Product] = []
 
     for group_key, product_rows in grouped.items():
-        group_code = product_rows[0]["group_code"]
-        title = product_rows[0]["title"]
+        group_code = product_rows[0].group_code
+        title = product_rows[0].title
         product_id = group_code
 
-        variants_by_size: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        variants_by_size: dict[str, list[Variant]] = defaultdict(list)
         for row in product_rows:
-            variants_by_size[row["size_code"]].append(row["variant"])
+            variants_by_size[row.size_code].append(row.variant)
 
         sizes = []
         for size_code, variants in sorted(variants_by_size.items(), key=lambda item: item[0]):
-            colors_count = len({clean(variant["color"]) for variant in variants if clean(variant["color"])})
+            colors_count = len({clean(variant.color) for variant in variants if clean(variant.color)})
             specs_source = next(
-                (
-                    variant
-                    for variant in variants
-                    if parse_specs_from_text(clean(variant.get("description"))).get("has_specs")
-                ),
-                variants[0] if variants else {},
+                (variant for variant in variants if has_specs(variant.description)),
+                variants[0],
             )
             sizes.append(
-                {
-                    "size_label": size_code,
-                    "size_code": size_code,
-                    "variants": variants,
-                    "colors_count": colors_count,
-                    "specs": parse_specs_from_text(clean(specs_source.get("description"))),
-                }
+                Size(
+                    size_label=size_code,
+                    size_code=size_code,
+                    variants=variants,
+                    colors_count=colors_count,
+                    specs=parse_specs_from_text(specs_source.description),
+                )
             )
 
-        representative_image = ""
-        for size in sizes:
-            for variant in size["variants"]:
-                image_url = clean(variant.get("image_url"))
-                if image_url:
-                    representative_image = image_url
-                    break
-            if representative_image:
-                break
-
-        variants_count = sum(len(size["variants"]) for size in sizes)
-        category_counts = Counter(row["category"] for row in product_rows if clean(row.get("category")))
+        representative_image = pick_representative_image(sizes)
+        variants_count = sum(len(size.variants) for size in sizes)
+        category_counts = Counter(row.category for row in product_rows if clean(row.category))
         resolved_category = (
             category_counts.most_common(1)[0][0]
             if category_counts
             else "Επαγγελματικός Εξοπλισμός"
         )
         products.append(
-            {
-                "id": product_id,
-                "family_indicator": clean(product_rows[0]["family_indicator"]),
-                "group_root": clean(product_rows[0]["group_root"]),
-                "title": title,
-                "category": resolved_category,
-                "representative_image": representative_image,
-                "sizes": sizes,
-                "sizes_count": len(sizes),
-                "variants_count": variants_count,
-            }
+            Product(
+                id=product_id,
+                family_indicator=clean(product_rows[0].family_indicator),
+                group_root=clean(product_rows[0].group_root),
+                title=title,
+                category=resolved_category,
+                representative_image=representative_image,
+                sizes=sizes,
+                sizes_count=len(sizes),
+                variants_count=variants_count,
+            )
         )
 
-    products.sort(key=lambda product: (product["group_root"], product["title"], product["id"]))
+    products.sort(key=product_sort_key)
     return products
 
 
-def parse_specs_from_text(text: str) -> dict[str, Any]:
-    normalized = clean(text).lower()
-    if not normalized:
-        return {
-            "liters": None,
-            "width": None,
-            "depth": None,
-            "box_height": None,
-            "diameter": None,
-            "height": None,
-            "has_specs": False,
-        }
+def row_additional_images(row: CatalogRow) -> list[str]:
+    packshot = clean(row.variant.image_url)
+    images = [
+        image
+        for image in row.additional_images
+        if clean(image)
+        and clean(image) != packshot
+        and "/packshot_photos/" not in clean(image).lower()
+        and "/packshot-test/" not in clean(image).lower()
+    ]
+    return list(dict.fromkeys(images))
 
-    liters_match = re.search(r"(\d+(?:[.,]\d+)?)\s*(?:lt|l)\b", normalized, flags=re.IGNORECASE)
-    box_3d_match = re.search(
-        r"(\d+(?:[.,]\d+)?)\s*x\s*(\d+(?:[.,]\d+)?)\s*x\s*(\d+(?:[.,]\d+)?)(?:\s*h)?",
-        normalized,
-        flags=re.IGNORECASE,
-    )
-    # 2D sizes like stickers: 8,5x33 cm (no depth)
-    box_2d_match = None
-    if not box_3d_match:
-        box_2d_match = re.search(
-            r"(\d+(?:[.,]\d+)?)\s*x\s*(\d+(?:[.,]\d+)?)(?:\s*(?:cm|χιλ|mm)\b|\b)",
-            normalized,
-            flags=re.IGNORECASE,
-        )
 
-    dimensions_match = re.search(
-        r"(?:^|[^a-z0-9])d\s*([0-9]+(?:[.,][0-9]+)?)\s*x\s*([0-9]+(?:[.,][0-9]+)?)\s*h?",
-        normalized,
-        flags=re.IGNORECASE,
-    ) or re.search(
-        r"ø\s*([0-9]+(?:[.,][0-9]+)?)\s*x\s*h?\s*([0-9]+(?:[.,][0-9]+)?)",
-        normalized,
-        flags=re.IGNORECASE,
-    )
-
-    liters = liters_match.group(1).replace(",", ".") if liters_match else None
-    explicit_diameter = dimensions_match.group(1).replace(",", ".") if dimensions_match else None
-    explicit_height = dimensions_match.group(2).replace(",", ".") if dimensions_match else None
-
-    box_width = box_3d_match.group(1).replace(",", ".") if box_3d_match else None
-    box_depth = box_3d_match.group(2).replace(",", ".") if box_3d_match else None
-    box_height = box_3d_match.group(3).replace(",", ".") if box_3d_match else None
-
-    # If diameter syntax exists (d..x..h or ø..x..), do not treat it as width-height.
-    if explicit_diameter:
-        box_2d_match = None
-
-    two_d_width = box_2d_match.group(1).replace(",", ".") if box_2d_match else None
-    two_d_height = box_2d_match.group(2).replace(",", ".") if box_2d_match else None
-
-    # Some records encode round products as 8x16x16h; normalize to Ø8 x H16.
-    looks_like_round_duplicate = (
-        not explicit_diameter
-        and box_width
-        and box_depth
-        and box_height
-        and box_depth == box_height
-    )
-
-    width = None
-    depth = None
-    height = explicit_height
-    parsed_box_height = None
-    diameter = explicit_diameter
-
-    if looks_like_round_duplicate:
-        diameter = explicit_diameter or box_width
-        height = explicit_height or box_depth
-    elif box_3d_match:
-        width = box_width
-        depth = box_depth
-        parsed_box_height = box_height
-    elif box_2d_match:
-        width = two_d_width
-        # For flat/2D specs, treat second value as height so UI can display W x H.
-        height = two_d_height
-
-    has_specs = any([liters, width, depth, parsed_box_height, diameter, height])
-    return {
-        "liters": liters,
-        "width": width,
-        "depth": depth,
-        "box_height": parsed_box_height,
-        "diameter": diameter,
-        "height": height,
-        "has_specs": has_specs,
-    }
+def row_image_urls(row: CatalogRow) -> list[str]:
+    """Every image URL the generator emits for this row (packshot first)."""
+    packshot = clean(row.variant.image_url)
+    return ([packshot] if packshot else []) + row_additional_images(row)
 
 
-def build_additional_images(rows: list[dict[str, Any]]) -> dict[str, list[str]]:
+def build_additional_images(rows: list[CatalogRow]) -> dict[str, list[str]]:
     mapping: dict[str, list[str]] = {}
     for row in rows:
-        code = row["variant"]["code"]
-        packshot = clean(row["variant"].get("image_url"))
-        images = [
-            image
-            for image in row["additional_images"]
-            if clean(image)
-            and clean(image) != packshot
-            and "/packshot_photos/" not in clean(image).lower()
-            and "/packshot-test/" not in clean(image).lower()
-        ]
+        images = row_additional_images(row)
         if not images:
             continue
-        deduped = list(dict.fromkeys(images))
-        mapping[code] = deduped
+        mapping[row.variant.code] = images
 
     return dict(sorted(mapping.items(), key=lambda item: item[0]))
 
 
-def is_url_reachable(url: str, timeout_seconds: float) -> bool:
-    if not url or not url.lower().startswith(("http://", "https://")):
-        return False
+def gallery_id(urls: list[str]) -> str:
+    """Content-derived id of an image list (order matters)."""
+    return hashlib.sha256("\n".join(urls).encode("utf-8")).hexdigest()[:12]
+
+
+def build_galleries(additional_images: dict[str, list[str]]) -> dict[str, Any]:
+    """Store each distinct image list once: gallery id -> URLs, plus code -> gallery id."""
+    galleries: dict[str, list[str]] = {}
+    codes: dict[str, str] = {}
+    for code, urls in additional_images.items():
+        key = gallery_id(urls)
+        if galleries.setdefault(key, urls) != urls:
+            raise ValueError(f"Gallery id collision for {key}")
+        codes[code] = key
+    return {
+        "format": "viomes-galleries/1",
+        "galleries": dict(sorted(galleries.items())),
+        "codes": codes,
+    }
+
+
+def probe_url(url: str, timeout_seconds: float, etag: str = "", last_modified: str = "") -> dict[str, Any]:
+    """Check one URL, optionally as a conditional request.
+
+    Returns the HTTP status (None for network failures, 0 for values that are
+    not a usable http(s) URL), whether the URL is reachable and the
+    validators to send next time.
+    """
+    result: dict[str, Any] = {"status": None, "reachable": False, "etag": "", "last_modified": ""}
+    url = request_url(url) if url else None
+    if url is None:
+        return unusable_url_result()
+
+    headers = {"User-Agent": URL_CHECK_USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
 
-    headers = {"User-Agent": "viomes-catalog-json-generator/1.0"}
     for method in ("HEAD", "GET"):
         request = Request(url, headers=headers, method=method)
         try:
             with urlopen(request, timeout=timeout_seconds) as response:
-                status = getattr(response, "status", None) or response.getcode()
-                return 200 <= int(status) < 400
+                status = int(getattr(response, "status", None) or response.getcode())
+                result.update(
+                    status=status,
+                    reachable=200 <= status < 400,
+                    etag=response.headers.get("ETag", ""),
+                    last_modified=response.headers.get("Last-Modified", ""),
+                )
+                return result
         except HTTPError as exc:
+            if exc.code == 304:
+                # Unchanged since the validators were issued.
+                result.update(
+                    status=304,
+                    reachable=True,
+                    etag=exc.headers.get("ETag") or etag,
+                    last_modified=exc.headers.get("Last-Modified") or last_modified,
+                )
+                return result
             # Some servers reject HEAD even if GET would work.
             if method == "HEAD" and exc.code in (405, 501):
                 continue
-            return False
+            result.update(status=exc.code)
+            return result
         except (URLError, TimeoutError):
-            return False
+            return result
         except Exception:
-            return False
+            return result
 
-    return False
+    return result
 
 
-def filter_unreachable_additional_images(
-    mapping: dict[str, list[str]],
+def is_url_reachable(url: str, timeout_seconds: float) -> bool:
+    return probe_url(url, timeout_seconds)["reachable"]
+
+
+def probe_url_before(
+    deadline_at: float | None,
+    url: str,
+    timeout_seconds: float,
+    etag: str = "",
+    last_modified: str = "",
+) -> dict[str, Any] | None:
+    """probe_url, or None if the deadline (time.monotonic()) has already passed.
+
+    The request timeout is clamped so no probe runs past the deadline.
+    """
+    if deadline_at is not None:
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            return None
+        timeout_seconds = min(timeout_seconds, remaining)
+    return probe_url(url, timeout_seconds, etag, last_modified)
+
+
+def probe_urls_threaded(
+    jobs: dict[str, tuple[str, str]],
     timeout_seconds: float,
     workers: int,
-) -> tuple[dict[str, list[str]], int, int]:
-    all_urls = sorted({url for urls in mapping.values() for url in urls})
-    if not all_urls:
-        return mapping, 0, 0
-
-    reachable_by_url: dict[str, bool] = {}
-    worker_count = max(1, min(workers, len(all_urls)))
+    deadline_seconds: float | None = None,
+) -> dict[str, dict[str, Any]]:
+    deadline_at = time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+    results: dict[str, dict[str, Any]] = {}
+    worker_count = max(1, min(workers, len(jobs)))
     with ThreadPoolExecutor(max_workers=worker_count) as executor:
+        # The executor runs jobs in submission order.
         futures = {
-            executor.submit(is_url_reachable, url, timeout_seconds): url
-            for url in all_urls
+            executor.submit(probe_url_before, deadline_at, url, timeout_seconds, *validators): url
+            for url, validators in jobs.items()
         }
         for future in as_completed(futures):
-            url = futures[future]
-            reachable_by_url[url] = future.result()
+            result = future.result()
+            if result is not None:
+                results[futures[future]] = result
+    return results
+
+
+def prioritize_url_jobs(
+    jobs: dict[str, tuple[str, str]],
+    cached_entries: dict[str, dict[str, Any]],
+    url_cache: UrlStatusCache | None,
+) -> dict[str, tuple[str, str]]:
+    """Order jobs for a deadline-bounded run.
+
+    Never-validated URLs come first, then the most recently added ones, then
+    those whose last check is oldest.
+    """
+
+    def priority(url: str) -> tuple[bool, float, float]:
+        first_seen = url_cache.first_seen(url) if url_cache else None
+        entry = cached_entries.get(url)
+        return (
+            entry is not None,
+            -(first_seen or 0.0),
+            entry["checked_at"] if entry else 0.0,
+        )
+
+    return {url: jobs[url] for url in sorted(jobs, key=priority)}
+
+
+def is_definitive_status(status: int | None) -> bool:
+    """Whether a probe status says something about the image itself.
+
+    Network failures, timeouts, throttling (408/429) and server errors (5xx)
+    only say the host could not answer right now; other statuses tell whether
+    the image exists. Status 0 marks a value that is not a usable URL at all.
+    """
+    if status is None or status in (408, 429):
+        return False
+    return status < 500
+
 
+def check_urls(
+    urls: list[str],
+    timeout_seconds: float,
+    workers: int,
+    url_cache: UrlStatusCache | None = None,
+    backend: str = "threads",
+    per_host: int = 8,
+    retries: int = 2,
+    stats: Counter[str] | None = None,
+    deadline_seconds: float | None = None,
+    unverified: set[str] | None = None,
+) -> dict[str, bool]:
+    """Return url -> keep it.
+
+    URLs the host could not answer for (see is_definitive_status), and with
+    ``deadline_seconds`` URLs not reached before the deadline, fall back to
+    their cached status, or are kept when they were never checked, so a slow
+    or throttling server never drops valid images. Those URLs are added to
+    ``unverified``.
+    """
+    stats = Counter() if stats is None else stats
+    reachable_by_url: dict[str, bool] = {}
+    cached_entries: dict[str, dict[str, Any]] = {}
+    jobs: dict[str, tuple[str, str]] = {}
+    if url_cache:
+        url_cache.mark_seen(urls)
+    for url in urls:
+        validators = plan_url_check(url, url_cache, cached_entries, reachable_by_url, stats)
+        if validators is not None:
+            jobs[url] = validators
+    if not jobs:
+        return reachable_by_url
+    if deadline_seconds is not None:
+        jobs = prioritize_url_jobs(jobs, cached_entries, url_cache)
+
+    if backend == "asyncio":
+        results = probe_urls_async(
+            jobs,
+            timeout_seconds=timeout_seconds,
+            max_concurrency=workers,
+            per_host=per_host,
+            retries=retries,
+            user_agent=URL_CHECK_USER_AGENT,
+            stats=stats,
+            deadline_seconds=deadline_seconds,
+        )
+    else:
+        results = probe_urls_threaded(jobs, timeout_seconds, workers, deadline_seconds=deadline_seconds)
+
+    record_url_results(jobs, results, url_cache, cached_entries, reachable_by_url, stats, unverified)
+    return reachable_by_url
+
+
+def plan_url_check(
+    url: str,
+    url_cache: UrlStatusCache | None,
+    cached_entries: dict[str, dict[str, Any]],
+    reachable_by_url: dict[str, bool],
+    stats: Counter[str],
+) -> tuple[str, str] | None:
+    """Answer ``url`` from a fresh cache entry, or return the validators to probe it with."""
+    entry = url_cache.get(url) if url_cache else None
+    if entry:
+        cached_entries[url] = entry
+    if entry and url_cache.is_fresh(entry):
+        stats["fresh"] += 1
+        reachable_by_url[url] = entry["reachable"]
+        return None
+    if entry and entry["reachable"]:
+        # Only revalidate URLs that were reachable; a 304 must not revive
+        # a URL that was previously missing.
+        return entry["etag"], entry["last_modified"]
+    return "", ""
+
+
+def record_url_results(
+    urls: Iterable[str],
+    results: dict[str, dict[str, Any]],
+    url_cache: UrlStatusCache | None,
+    cached_entries: dict[str, dict[str, Any]],
+    reachable_by_url: dict[str, bool],
+    stats: Counter[str],
+    unverified: set[str] | None = None,
+) -> None:
+    """Turn probe results for ``urls`` into keep/drop verdicts (see check_urls)."""
+    for url in urls:
+        result = results.get(url)
+        if result is None:
+            # Not reached before the deadline.
+            stats["unreached"] += 1
+        elif is_definitive_status(result["status"]):
+            stats["probed"] += 1
+            if result["status"] == 304:
+                stats["not_modified"] += 1
+            reachable_by_url[url] = result["reachable"]
+            if url_cache:
+                url_cache.put(url, result)
+            continue
+        else:
+            stats["unverified"] += 1
+        if unverified is not None:
+            unverified.add(url)
+        entry = cached_entries.get(url)
+        reachable_by_url[url] = entry["reachable"] if entry else True
+
+
+class UrlValidationPipeline:
+    """Check URLs on a background thread while the workbook is still being read.
+
+    URLs are submitted as rebuilt groups are built and checked as they
+    arrive, by one checker that lives for the whole build: the asyncio
+    backend keeps its keep-alive connections and concurrency limit, the
+    threads backend its worker pool. Fresh cache entries are answered
+    without a request. The result only depends on the set of URLs, so
+    output stays deterministic. The URL cache is opened on the worker thread
+    (SQLite connections are bound to their thread) and committed after each
+    batch, so it never holds the database lock for long. ``close`` stops the
+    pipeline without waiting for pending checks; call it when the build
+    fails before ``finish``.
+    """
+
+    def __init__(
+        self,
+        check_options: dict[str, Any],
+        url_cache_path: Path | None,
+        url_cache_ttl_seconds: float,
+        deadline_seconds: float | None = None,
+    ) -> None:
+        self.check_options = check_options
+        self.url_cache_path = url_cache_path
+        self.url_cache_ttl_seconds = url_cache_ttl_seconds
+        self.deadline_at = time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+        self.stats: Counter[str] = Counter()
+        self.reachable_by_url: dict[str, bool] = {}
+        self.unverified: set[str] = set()
+        self.queue: queue.Queue[str | None] = queue.Queue()
+        self.submitted: set[str] = set()
+        self.error: BaseException | None = None
+        self.abort = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="url-validation", daemon=True)
+        self.thread.start()
+
+    def submit(self, url: str) -> None:
+        if url and url not in self.submitted:
+            self.submitted.add(url)
+            self.queue.put(url)
+
+    def finish(self) -> dict[str, bool]:
+        self.queue.put(None)
+        self.thread.join()
+        if self.error:
+            raise self.error
+        return self.reachable_by_url
+
+    def close(self) -> None:
+        """Cancel pending checks and wait for the worker thread (and URL cache) to shut down."""
+        if self.thread.is_alive():
+            self.abort.set()
+            self.queue.put(None)
+            self.thread.join()
+
+    def next_batch(self) -> tuple[list[str], bool]:
+        """Block for the next URL, then take everything else already queued."""
+        batch: list[str] = []
+        item = self.queue.get()
+        while True:
+            if item is None:
+                return batch, True
+            batch.append(item)
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return batch, False
+
+    def run(self) -> None:
+        url_cache = None
+        try:
+            if self.url_cache_path:
+                url_cache = UrlStatusCache(self.url_cache_path, ttl_seconds=self.url_cache_ttl_seconds)
+            cached_entries: dict[str, dict[str, Any]] = {}
+            jobs: list[str] = []
+
+            def plan(urls: list[str]) -> dict[str, tuple[str, str]]:
+                batch_jobs: dict[str, tuple[str, str]] = {}
+                if url_cache:
+                    url_cache.mark_seen(urls)
+                for url in urls:
+                    validators = plan_url_check(url, url_cache, cached_entries, self.reachable_by_url, self.stats)
+                    if validators is not None:
+                        batch_jobs[url] = validators
+                if url_cache:
+                    url_cache.commit()
+                jobs.extend(batch_jobs)
+                return batch_jobs
+
+            if self.check_options["backend"] == "asyncio":
+                results = self.probe_async(plan)
+            else:
+                results = self.probe_threaded(plan)
+            record_url_results(
+                jobs,
+                results,
+                url_cache,
+                cached_entries,
+                self.reachable_by_url,
+                self.stats,
+                self.unverified,
+            )
+        except BaseException as exc:
+            self.error = exc
+        finally:
+            if url_cache:
+                url_cache.close()
+
+    def probe_async(self, plan: Callable[[list[str]], dict[str, tuple[str, str]]]) -> dict[str, dict[str, Any]]:
+        deadline_seconds = None
+        if self.deadline_at is not None:
+            deadline_seconds = max(0.0, self.deadline_at - time.monotonic())
+        results, checker = asyncio.run(
+            probe_queued(
+                self.next_batch,
+                plan,
+                {
+                    "timeout_seconds": self.check_options["timeout_seconds"],
+                    "max_concurrency": self.check_options["workers"],
+                    "per_host": self.check_options["per_host"],
+                    "retries": self.check_options["retries"],
+                    "user_agent": URL_CHECK_USER_AGENT,
+                },
+                deadline_seconds=deadline_seconds,
+                abort=self.abort,
+            )
+        )
+        add_checker_stats(checker, self.stats)
+        return results
+
+    def probe_threaded(self, plan: Callable[[list[str]], dict[str, tuple[str, str]]]) -> dict[str, dict[str, Any]]:
+        timeout_seconds = self.check_options["timeout_seconds"]
+        futures = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, self.check_options["workers"]))
+        try:
+            finished = False
+            while not finished:
+                urls, finished = self.next_batch()
+                for url, validators in plan(urls).items():
+                    future = executor.submit(probe_url_before, self.deadline_at, url, timeout_seconds, *validators)
+                    futures[future] = url
+        finally:
+            executor.shutdown(wait=True, cancel_futures=self.abort.is_set())
+        # probe_url_before gives None for URLs not reached before the deadline.
+        return {
+            url: future.result()
+            for future, url in futures.items()
+            if not future.cancelled() and future.result() is not None
+        }
+
+
+def filter_additional_images(
+    mapping: dict[str, list[str]],
+    reachable_by_url: dict[str, bool],
+) -> tuple[dict[str, list[str]], int, int]:
     filtered: dict[str, list[str]] = {}
     total_urls = 0
     removed_urls = 0
+    # Color variants of a size usually share one gallery; filter each
+    # distinct gallery once and reuse the result.
+    valid_by_gallery: dict[tuple[str, ...], list[str]] = {}
     for code, urls in mapping.items():
+        gallery = tuple(urls)
+        valid_urls = valid_by_gallery.get(gallery)
+        if valid_urls is None:
+            valid_urls = valid_by_gallery[gallery] = [url for url in urls if reachable_by_url.get(url, False)]
         total_urls += len(urls)
-        valid_urls = [url for url in urls if reachable_by_url.get(url, False)]
         removed_urls += len(urls) - len(valid_urls)
         if valid_urls:
             filtered[code] = valid_urls
@@ -413,6 +908,400 @@ def filter_unreachable_additional_images(
     return dict(sorted(filtered.items(), key=lambda item: item[0])), total_urls, removed_urls
 
 
+def filter_unreachable_additional_images(
+    mapping: dict[str, list[str]],
+    timeout_seconds: float,
+    workers: int,
+    url_cache: UrlStatusCache | None = None,
+    backend: str = "threads",
+    per_host: int = 8,
+    retries: int = 2,
+    stats: Counter[str] | None = None,
+    deadline_seconds: float | None = None,
+) -> tuple[dict[str, list[str]], int, int]:
+    all_urls = sorted({url for urls in mapping.values() for url in urls})
+    if not all_urls:
+        return mapping, 0, 0
+
+    reachable_by_url = check_urls(
+        all_urls,
+        timeout_seconds,
+        workers,
+        url_cache=url_cache,
+        backend=backend,
+        per_host=per_host,
+        retries=retries,
+        stats=stats,
+        deadline_seconds=deadline_seconds,
+    )
+    return filter_additional_images(mapping, reachable_by_url)
+
+
+def product_packshot_urls(product: Product) -> list[str]:
+    return [
+        clean(variant.image_url)
+        for size in product.sizes
+        for variant in size.variants
+        if clean(variant.image_url)
+    ]
+
+
+def drop_unreachable_packshots(product: Product, reachable_by_url: dict[str, bool]) -> int:
+    """Blank dead variant packshots and re-pick the representative image.
+
+    The site already falls back from an empty variant ``image_url`` to the
+    product's ``representative_image``, which becomes the next reachable
+    variant packshot. Returns the number of packshots removed.
+    """
+    removed = 0
+    for size in product.sizes:
+        for index, variant in enumerate(size.variants):
+            image_url = clean(variant.image_url)
+            if image_url and not reachable_by_url.get(image_url, False):
+                # Copy instead of mutating: variants are shared with the rows.
+                size.variants[index] = replace(variant, image_url="")
+                removed += 1
+    product.representative_image = pick_representative_image(product.sizes)
+    return removed
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_group_rows(rows: list[CatalogRow]) -> str:
+    encoded = json.dumps([row.as_tuple() for row in rows], ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def serialize_product(product: Product) -> str:
+    """Serialize one product exactly as it appears inside products-grouped.json."""
+    text = json.dumps(product.to_json(), ensure_ascii=False, indent=2)
+    return "\n".join(f"    {line}" for line in text.splitlines())
+
+
+def serialize_products_payload(
+    source_file: str,
+    product_fragments: list[str],
+    family_grouping_applied: bool = False,
+) -> str:
+    """Assemble products-grouped.json from per-product fragments.
+
+    Byte-identical to json.dumps(payload, ensure_ascii=False, indent=2), so
+    cached fragments can be reused without re-serializing their products.
+    ``family_grouping_applied`` tells the site the products are already split.
+    """
+    products_json = "[\n" + ",\n".join(product_fragments) + "\n  ]" if product_fragments else "[]"
+    return (
+        "{\n"
+        f'  "source_file": {json.dumps(source_file, ensure_ascii=False)},\n'
+        f'  "products_count": {len(product_fragments)},\n'
+        + ('  "family_grouping_applied": true,\n' if family_grouping_applied else "")
+        + f'  "products": {products_json}\n'
+        "}"
+    )
+
+
+def product_summary(product: Product) -> dict[str, Any]:
+    summary = {field: getattr(product, field) for field in MANIFEST_FIELDS}
+    # Only split products (--grouping-rules) carry a subcategory.
+    if product.subcategory:
+        summary["subcategory"] = product.subcategory
+    return summary
+
+
+def serialize_group(entry: dict[str, Any], product: Product, split_rules: dict[str, list[dict[str, Any]]]) -> None:
+    """Store a group's sort key, summaries and product fragments in its build cache entry.
+
+    A split group keeps its place in the ordering and lists its split
+    products in rule order, as the site's loader did.
+    """
+    split_products = split_grouped_product(product, split_rules)
+    entry["sort_key"] = list(product_sort_key(product))
+    entry["summaries"] = [product_summary(item) for item in split_products]
+    entry["products_json"] = [serialize_product(item) for item in split_products]
+
+
+def shard_file_name(product_id: str) -> str:
+    # Product ids are group codes today; quote anything that is not
+    # filename- and URL-safe so the site can rebuild the path from the id.
+    return f"{quote(product_id, safe='')}.json"
+
+
+def write_catalog_shards(
+    shards_dir: Path,
+    source_file: str,
+    entries: list[dict[str, Any]],
+) -> list[Path]:
+    """Write manifest.json plus products/<id>.json (one product each) and return the written paths.
+
+    Shards are the products exactly as in products-grouped.json. Shards of
+    products that no longer exist are removed.
+    """
+    products_dir = shards_dir / "products"
+    products_dir.mkdir(parents=True, exist_ok=True)
+
+    summaries = [summary for entry in entries for summary in entry["summaries"]]
+    fragments = [fragment for entry in entries for fragment in entry["products_json"]]
+    written: list[Path] = []
+    for summary, fragment in zip(summaries, fragments):
+        path = products_dir / shard_file_name(summary["id"])
+        # Cached fragments are indented for products-grouped.json; drop the
+        # four-space prefix to get the standalone product JSON back.
+        write_text_if_changed(path, "\n".join(line[4:] for line in fragment.splitlines()))
+        written.append(path)
+
+    current = set(written)
+    for stale in products_dir.glob("*.json"):
+        if stale not in current:
+            stale.unlink()
+
+    manifest_path = shards_dir / "manifest.json"
+    manifest = {
+        "source_file": source_file,
+        "products_count": len(summaries),
+        "products": summaries,
+    }
+    write_text_if_changed(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2))
+    return [manifest_path, *written]
+
+
+def build_derived_artifacts(
+    args: argparse.Namespace,
+    products_text: str,
+    additional_images: dict[str, list[str]],
+    slugs_by_code: dict[str, str],
+) -> dict[str, tuple[Path, Any, str]]:
+    """Requested artifacts derived from the final outputs, as key -> (path, data, summary note).
+
+    They are built after splits and URL validation, so they always agree with
+    products-grouped.json and additional-images.json.
+    """
+    requested = {
+        "compact": args.compact_out,
+        "search_index": args.search_index_out,
+        "facet_index": args.facet_index_out,
+        "code_index": args.code_index_out,
+        "galleries": args.galleries_out,
+    }
+    requested = {key: path for key, path in requested.items() if path}
+    if not requested:
+        return {}
+
+    payload = json.loads(products_text) if requested.keys() - {"galleries"} else {}
+    artifacts: dict[str, tuple[Path, Any, str]] = {}
+    if "compact" in requested:
+        compact = encode_catalog(payload)
+        artifacts["compact"] = (requested["compact"], compact, f"{len(compact['strings'])} distinct strings")
+    if "search_index" in requested:
+        search_index = build_search_index(payload["products"], slugs_by_code)
+        artifacts["search_index"] = (requested["search_index"], search_index, f"{len(search_index['tokens'])} tokens")
+    if "facet_index" in requested:
+        facet_index = build_facet_index(payload["products"])
+        facet_values = sum(len(values) for values in facet_index["facets"].values())
+        artifacts["facet_index"] = (requested["facet_index"], facet_index, f"{facet_values} facet values")
+    if "code_index" in requested:
+        code_index = build_code_index(payload["products"])
+        artifacts["code_index"] = (requested["code_index"], code_index, f"{len(code_index['codes'])} codes")
+    if "galleries" in requested:
+        galleries = build_galleries(additional_images)
+        per_code_bytes = len(json.dumps(additional_images, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        gallery_bytes = len(json.dumps(galleries, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        artifacts["galleries"] = (
+            requested["galleries"],
+            galleries,
+            f"{len(galleries['galleries'])} galleries for {len(galleries['codes'])} codes, "
+            f"{gallery_bytes / 1024:.1f} KB vs {per_code_bytes / 1024:.1f} KB minified per-code map",
+        )
+    return artifacts
+
+
+def write_category_listings(
+    listings_dir: Path,
+    products: list[dict[str, Any]],
+    first_page_size: int,
+    page_size: int,
+) -> list[Path]:
+    """Write index.json plus <category>/page-N.json (see catalog_listings.py) and return the written paths.
+
+    Pages left over from a longer listing are removed.
+    """
+    files = build_category_listings(products, first_page_size=first_page_size, page_size=page_size)
+    written = []
+    for relative_path, data in files.items():
+        path = listings_dir / relative_path
+        write_minified_json(path, data)
+        written.append(path)
+
+    current = set(written)
+    for stale in listings_dir.glob("*/page-*.json"):
+        if stale not in current:
+            stale.unlink()
+    return written
+
+
+def listing_summary_lines(listings_dir: Path, listing_paths: list[Path]) -> list[str]:
+    index = json.loads(listing_paths[0].read_text(encoding="utf-8"))
+    lines = [f"Wrote {listing_paths[0]} ({len(listing_paths) - 1} listing pages)"]
+    for category in index["categories"]:
+        sizes = ", ".join(
+            f"{(listings_dir / page).stat().st_size / 1024:.1f}" for page in category["pages"]
+        )
+        lines.append(
+            f"  {category['slug']}: {category['products_count']} products, "
+            f"{len(category['pages'])} page{'' if len(category['pages']) == 1 else 's'} ({sizes} KB)"
+        )
+    return lines
+
+
+def write_text_if_changed(path: Path, text: str) -> bool:
+    """Replace ``path`` atomically with ``text`` (UTF-8) unless it already holds exactly that.
+
+    Unchanged outputs keep their mtime, so dev servers watching them do not
+    reload for nothing. Returns whether the file was written.
+    """
+    return write_bytes_if_changed(path, text.encode("utf-8"))
+
+
+def write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    """Bytes version of write_text_if_changed."""
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging_path = path.with_name(path.name + ".tmp")
+    staging_path.write_bytes(data)
+    os.replace(staging_path, path)
+    return True
+
+
+def write_minified_json(path: Path, data: Any) -> None:
+    write_text_if_changed(path, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+
+
+def minify_json(text: str) -> str:
+    return json.dumps(json.loads(text), ensure_ascii=False, separators=(",", ":"))
+
+
+def write_hashed_artifacts(out_dir: Path, artifacts: dict[str, tuple[str, str]]) -> list[Path]:
+    """Write content-hashed, precompressed copies plus the catalog-version.json pointer.
+
+    ``artifacts`` maps a pointer key to ``(file stem, JSON text)``. Each text is
+    minified and written as ``<stem>.<hash>.json`` with ``.gz`` (and, when the
+    brotli package is installed, ``.br``) sidecars. Compression is
+    deterministic, so unchanged content keeps its file names and bytes.
+    Hashed files from the previous pointer are kept for clients that loaded it
+    just before a deploy; older ones are removed. Returns the written paths.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pointer_path = out_dir / "catalog-version.json"
+    try:
+        previous = json.loads(pointer_path.read_text(encoding="utf-8")).get("files", {})
+    except (OSError, ValueError, AttributeError):
+        previous = {}
+
+    files: dict[str, str] = {}
+    written: list[Path] = []
+    for key, (stem, text) in artifacts.items():
+        data = minify_json(text).encode("utf-8")
+        name = f"{stem}.{hashlib.sha256(data).hexdigest()[:16]}.json"
+        sidecars = {"": data, ".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            sidecars[".br"] = brotli.compress(data, quality=11)
+        for suffix, content in sidecars.items():
+            path = out_dir / f"{name}{suffix}"
+            # A file left half-written by an interrupted run has the right
+            # name but not the right bytes, so compare contents, not names.
+            write_bytes_if_changed(path, content)
+            written.append(path)
+        files[key] = name
+
+    keep = set(files.values()) | set(previous.values())
+    for stem, _ in artifacts.values():
+        for path in out_dir.glob(f"{stem}.*.json*"):
+            if path.name.split(".json", 1)[0] + ".json" not in keep:
+                path.unlink()
+
+    pointer = {
+        "version": hashlib.sha256("\n".join(sorted(files.values())).encode("utf-8")).hexdigest()[:16],
+        "encodings": ["br", "gzip"] if brotli is not None else ["gzip"],
+        "files": files,
+    }
+    # Replace the pointer atomically so readers never see a half-written file.
+    staging_path = pointer_path.with_name(pointer_path.name + ".tmp")
+    staging_path.write_text(json.dumps(pointer, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(staging_path, pointer_path)
+    return [pointer_path, *written]
+
+
+def generator_source_hash() -> str:
+    """SHA-256 over this script and the catalog_*.py modules next to it.
+
+    Specs parsing, records, the workbook reader and every derived output live
+    in those modules, so an edit to any of them must invalidate the cache.
+    """
+    digest = hashlib.sha256()
+    script_path = Path(__file__).resolve()
+    for path in [script_path, *sorted(script_path.parent.glob("catalog_*.py"))]:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(sha256_file(path).encode("ascii"))
+    return digest.hexdigest()
+
+
+def build_settings(args: argparse.Namespace, xlsx_path: Path) -> dict[str, Any]:
+    """Everything besides the workbook content that changes the generated files."""
+    return {
+        "cache_version": BUILD_CACHE_VERSION,
+        "generator": generator_source_hash(),
+        "source_file": xlsx_path.name,
+        "sheet": args.sheet,
+        "skip_url_validation": args.skip_url_validation,
+        "shards_out": str(args.shards_out) if args.shards_out else None,
+        "grouping_rules": sha256_file(args.grouping_rules) if args.grouping_rules else None,
+        "compact_out": str(args.compact_out) if args.compact_out else None,
+        "search_index_out": str(args.search_index_out) if args.search_index_out else None,
+        "facet_index_out": str(args.facet_index_out) if args.facet_index_out else None,
+        "code_index_out": str(args.code_index_out) if args.code_index_out else None,
+        "galleries_out": str(args.galleries_out) if args.galleries_out else None,
+        "listings_out": str(args.listings_out) if args.listings_out else None,
+        "listing_page_sizes": [args.listing_first_page_size, args.listing_page_size],
+        "hashed_out": str(args.hashed_out) if args.hashed_out else None,
+        "brotli": brotli is not None,
+    }
+
+
+def load_build_cache(path: Path, settings: dict[str, Any]) -> dict[str, Any]:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    # A cache written with other settings (or by another generator version)
+    # cannot be reused at all.
+    if not isinstance(cache, dict) or cache.get("settings") != settings:
+        return {}
+    return cache
+
+
+def save_build_cache(path: Path, cache: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+
+
+def outputs_match_cache(cache: dict[str, Any], output_paths: list[Path]) -> bool:
+    # Recorded outputs include every shard written last time.
+    recorded = cache.get("outputs", {})
+    for path in {*map(str, output_paths), *recorded}:
+        if not Path(path).is_file() or recorded.get(path) != sha256_file(Path(path)):
+            return False
+    return True
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate catalog JSON files from XLSX.")
     parser.add_argument(
@@ -426,6 +1315,43 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Sheet name. Defaults to the first sheet.",
     )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="openpyxl",
+        help=(
+            "Workbook reader. 'xml' parses the sheet XML straight from the .xlsx zip "
+            "and reads only the catalog columns; output is identical to 'openpyxl'."
+        ),
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help=(
+            "Open the workbook with openpyxl in read-only mode and stream rows instead of "
+            "loading the full cell model. Only for --engine openpyxl; 'xml' always streams."
+        ),
+    )
+    parser.add_argument(
+        "--stream-groups",
+        action="store_true",
+        help=(
+            "Build each product as soon as its group's rows end instead of reading every "
+            "row first, so only a window of groups' rows is held at once. With "
+            "--skip-url-validation each product is also serialized and released as it is "
+            "built. The serialized catalog is still held until the outputs are written. "
+            "Groups that resume after they were built are re-read and rebuilt; output is identical."
+        ),
+    )
+    parser.add_argument(
+        "--stream-window",
+        type=int,
+        default=STREAM_GROUP_WINDOW,
+        help=(
+            "With --stream-groups, how many finished groups to hold back in case they "
+            f"resume further down the sheet (default: {STREAM_GROUP_WINDOW})."
+        ),
+    )
     parser.add_argument(
         "--products-out",
         type=Path,
@@ -438,24 +1364,234 @@ def parse_args() -> argparse.Namespace:
         default=Path("src/data/additional-images.json"),
         help="Output path for additional-images JSON.",
     )
+    parser.add_argument(
+        "--grouping-rules",
+        type=Path,
+        default=DEFAULT_GROUPING_RULES,
+        help=(
+            f"Family grouping rules JSON (default: {DEFAULT_GROUPING_RULES}). Split groups are "
+            "written as separate products, as the site shows them, so the site does not split "
+            "them at load time and the derived outputs describe the same products."
+        ),
+    )
+    parser.add_argument(
+        "--no-grouping-rules",
+        dest="grouping_rules",
+        action="store_const",
+        const=None,
+        help="Write groups unsplit; the site then splits them when it loads the catalog.",
+    )
+    parser.add_argument(
+        "--shards-out",
+        type=Path,
+        default=None,
+        help=(
+            "Also write a sharded catalog to this folder: manifest.json with per-product "
+            "summaries and products/<id>.json with each product's full record."
+        ),
+    )
+    parser.add_argument(
+        "--compact-out",
+        type=Path,
+        default=None,
+        help=(
+            "Also write products-grouped.json in the compact string-table format "
+            "(see catalog_compact.py) to this path."
+        ),
+    )
+    parser.add_argument(
+        "--search-index-out",
+        type=Path,
+        default=None,
+        help=(
+            "Also write an accent-folded, prefix-searchable token index over titles, English "
+            "slugs, descriptions, colors and codes (see catalog_search.py) to this path."
+        ),
+    )
+    parser.add_argument(
+        "--facet-index-out",
+        type=Path,
+        default=None,
+        help=(
+            "Also write a facet index (category, color, family_indicator -> product ids) "
+            "and sorted liters/diameter/height/width arrays (see catalog_facets.py) to this path."
+        ),
+    )
+    parser.add_argument(
+        "--code-index-out",
+        type=Path,
+        default=None,
+        help=(
+            "Also write a lookup of variant code -> [product id, size index, variant index] "
+            "and group_root -> product ids (see catalog_lookup.py) to this path."
+        ),
+    )
+    parser.add_argument(
+        "--galleries-out",
+        type=Path,
+        default=None,
+        help=(
+            "Also write the additional images with each distinct image list stored once "
+            "under a content-derived gallery id, plus a code -> gallery id map, to this path."
+        ),
+    )
+    parser.add_argument(
+        "--listings-out",
+        type=Path,
+        default=None,
+        help=(
+            "Also write paginated listing pages per site category, with card fields only "
+            "and in site order, plus an index.json (see catalog_listings.py) to this folder."
+        ),
+    )
+    parser.add_argument(
+        "--listing-first-page-size",
+        type=int,
+        default=FIRST_PAGE_SIZE,
+        help="With --listings-out, products on each category's first page (kept small to inline or preload).",
+    )
+    parser.add_argument(
+        "--listing-page-size",
+        type=int,
+        default=PAGE_SIZE,
+        help="With --listings-out, products on each later page.",
+    )
+    parser.add_argument(
+        "--hashed-out",
+        type=Path,
+        default=None,
+        help=(
+            "Also write minified, content-hashed copies of the outputs with .gz/.br sidecars "
+            "to this folder, plus a catalog-version.json pointer naming the current files."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Record wall time, CPU time and peak traced memory per build stage, plus row, "
+            "group and URL counters, and write them as JSON (see catalog_profile.py)."
+        ),
+    )
+    parser.add_argument(
+        "--profile-out",
+        type=Path,
+        default=Path(".cache/catalog-build-profile.json"),
+        help="With --profile, report path. Kept in the ignored .cache/ by default, next to the build cache.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running after the build and rebuild incrementally whenever a workbook in "
+            "the source folder is saved (~$ lock files are ignored)."
+        ),
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=0.5,
+        help="With --watch, seconds between checks of the source folder.",
+    )
+    parser.add_argument(
+        "--watch-debounce",
+        type=float,
+        default=1.0,
+        help="With --watch, seconds the folder must stay unchanged before a rebuild starts.",
+    )
+    parser.add_argument(
+        "--build-cache",
+        type=Path,
+        default=Path(".cache/catalog-build.json"),
+        help="Build cache used to skip unchanged workbooks and reuse unchanged product groups.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the build cache and rebuild every product group.",
+    )
     parser.add_argument(
         "--skip-url-validation",
         action="store_true",
-        help="Skip URL reachability checks for additional images.",
+        help="Skip URL reachability checks for packshots and additional images.",
     )
     parser.add_argument(
         "--url-timeout",
         type=float,
         default=6.0,
-        help="Timeout in seconds for each additional-image URL check.",
+        help="Timeout in seconds for each image URL check.",
     )
     parser.add_argument(
         "--url-workers",
         type=int,
         default=24,
-        help="Parallel workers for additional-image URL checks.",
+        help="Parallel workers for URL checks (the concurrency ceiling for the asyncio backend).",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--url-backend",
+        choices=URL_BACKENDS,
+        default="asyncio",
+        help=(
+            "URL checker. 'asyncio' reuses keep-alive connections per host, adapts "
+            "concurrency and honours Retry-After; 'threads' opens a new connection per "
+            "request with a fixed worker count."
+        ),
+    )
+    parser.add_argument(
+        "--url-per-host",
+        type=int,
+        default=8,
+        help="With --url-backend asyncio, maximum concurrent connections per host.",
+    )
+    parser.add_argument(
+        "--url-retries",
+        type=int,
+        default=2,
+        help="With --url-backend asyncio, retries for network errors and 502/504 responses.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help=(
+            "Start URL checks while the workbook is still being parsed instead of after "
+            "grouping: rows are grouped as they are read (as with --stream-groups) and "
+            "each rebuilt group's image URLs are queued as soon as it is built."
+        ),
+    )
+    parser.add_argument(
+        "--validation-deadline",
+        type=float,
+        default=None,
+        help=(
+            "Seconds URL validation may take. URLs are checked newest and never-validated "
+            "first; those not reached in time keep their last known status."
+        ),
+    )
+    parser.add_argument(
+        "--url-cache",
+        type=Path,
+        default=Path(".cache/url-status.sqlite3"),
+        help="SQLite cache of URL check results (status, ETag, Last-Modified, check time).",
+    )
+    parser.add_argument(
+        "--url-cache-ttl",
+        type=float,
+        default=24.0,
+        help="Hours a cached URL result is trusted before it is revalidated.",
+    )
+    parser.add_argument(
+        "--no-url-cache",
+        action="store_true",
+        help="Check every URL over the network without reading or writing the URL cache.",
+    )
+    args = parser.parse_args()
+    if args.listing_first_page_size < 1 or args.listing_page_size < 1:
+        parser.error("listing page sizes must be at least 1")
+    if args.stream_window < 0:
+        parser.error("--stream-window must be at least 0")
+    if args.streaming and args.engine != "openpyxl":
+        parser.error("--streaming only applies to --engine openpyxl; 'xml' always streams")
+    return args
 
 
 def resolve_xlsx_path(explicit_path: Path | None) -> Path:
@@ -470,52 +1606,525 @@ def resolve_xlsx_path(explicit_path: Path | None) -> Path:
     return candidates[0]
 
 
-def main() -> None:
-    args = parse_args()
-    xlsx_path = resolve_xlsx_path(args.xlsx)
-
-    workbook = openpyxl.load_workbook(xlsx_path, read_only=False, data_only=True)
-    worksheet = workbook[args.sheet] if args.sheet else workbook[workbook.sheetnames[0]]
-
-    rows = build_rows(worksheet)
-    products = build_grouped_products(rows)
-    additional_images = build_additional_images(rows)
-    total_additional_urls = sum(len(urls) for urls in additional_images.values())
-    removed_additional_urls = 0
-    if not args.skip_url_validation:
-        additional_images, total_additional_urls, removed_additional_urls = filter_unreachable_additional_images(
-            additional_images,
-            timeout_seconds=args.url_timeout,
-            workers=args.url_workers,
+def load_worksheet(xlsx_path: Path, sheet: str | None, streaming: bool) -> tuple[Any, Any]:
+    # Read-only workbooks parse the sheet XML lazily while iterating, so memory
+    # stays bounded by one row instead of the whole cell/style model. Styles are
+    # still resolved per cell, which is all is_green_description_cell needs.
+    workbook = openpyxl.load_workbook(xlsx_path, read_only=streaming, data_only=True)
+    worksheet = workbook[sheet] if sheet else workbook[workbook.sheetnames[0]]
+    return workbook, worksheet
+
+
+def iter_source_rows(
+    xlsx_path: Path,
+    sheet: str | None,
+    engine: str,
+    streaming: bool,
+    stats: Counter[str] | None = None,
+) -> Iterator[CatalogRow]:
+    """Open the workbook now and return an iterator over its catalog rows.
+
+    With openpyxl the workbook is loaded before this returns, so the load can
+    be timed apart from row parsing. The xml engine reads the sheet lazily.
+    """
+    if engine == "xml":
+        records = iter_xlsx_records(
+            xlsx_path,
+            sheet,
+            RECORD_COLUMNS,
+            flag_column=COL_DESCRIPTION,
+            fill_hex_suffix=GREEN_FILL_HEX_SUFFIX,
         )
+        return iter_catalog_rows_from_records(records, stats)
 
-    products_payload = {
-        "source_file": xlsx_path.name,
-        "products_count": len(products),
-        "products": products,
+    workbook, worksheet = load_worksheet(xlsx_path, sheet, streaming=streaming)
+
+    def rows() -> Iterator[CatalogRow]:
+        try:
+            yield from iter_catalog_rows(worksheet, stats)
+        finally:
+            # Read-only workbooks keep the zip archive open until closed.
+            workbook.close()
+
+    return rows()
+
+
+def read_rows(xlsx_path: Path, sheet: str | None, engine: str, streaming: bool) -> list[CatalogRow]:
+    return list(iter_source_rows(xlsx_path, sheet, engine, streaming))
+
+
+def diff_catalog(
+    old_rows: list[CatalogRow],
+    new_rows: list[CatalogRow],
+    split_rules: dict[str, list[dict[str, Any]]],
+) -> dict[str, Any]:
+    """Row delta plus the products and additional images of every touched group (see catalog_diff.py)."""
+    delta = diff_rows(old_rows, new_rows, row_group_key)
+    touched = touched_groups(delta, old_rows, new_rows, row_group_key)
+    old_groups = group_rows_by_key(row for row in old_rows if row_group_key(row) in touched)
+    new_groups = group_rows_by_key(row for row in new_rows if row_group_key(row) in touched)
+
+    def group_products(groups: dict[str, list[CatalogRow]]) -> list[Product]:
+        products = [product for rows in groups.values() for product in build_grouped_products(rows)]
+        products.sort(key=product_sort_key)
+        return [item for product in products for item in split_grouped_product(product, split_rules)]
+
+    upsert = group_products(new_groups)
+    upsert_keys = {(product.group_root, product.id) for product in upsert}
+    remove = [
+        [product.group_root, product.id]
+        for product in group_products(old_groups)
+        if (product.group_root, product.id) not in upsert_keys
+    ]
+
+    old_images = build_additional_images([row for rows in old_groups.values() for row in rows])
+    new_images = build_additional_images([row for rows in new_groups.values() for row in rows])
+    image_changes: dict[str, list[str] | None] = {
+        code: new_images.get(code)
+        for code in sorted(old_images.keys() | new_images.keys())
+        if old_images.get(code) != new_images.get(code)
     }
 
-    args.products_out.parent.mkdir(parents=True, exist_ok=True)
-    args.additional_out.parent.mkdir(parents=True, exist_ok=True)
+    delta["family_grouping_applied"] = bool(split_rules)
+    delta["products"] = {"upsert": [product.to_json() for product in upsert], "remove": remove}
+    delta["additional_images"] = image_changes
+    return delta
+
 
-    args.products_out.write_text(
-        json.dumps(products_payload, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+def parse_diff_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="generate_catalog_json.py diff",
+        description="Write the keyed delta between two catalog workbooks (see catalog_diff.py).",
+    )
+    parser.add_argument("old_xlsx", type=Path, help="Previous workbook, e.g. the _old.xlsx copy.")
+    parser.add_argument("new_xlsx", type=Path, help="Current workbook.")
+    parser.add_argument("--sheet", default=None, help="Sheet name. Defaults to the first sheet.")
+    parser.add_argument("--engine", choices=ENGINES, default="xml", help="Workbook reader for both workbooks.")
+    parser.add_argument(
+        "--grouping-rules",
+        type=Path,
+        default=DEFAULT_GROUPING_RULES,
+        help=(
+            "Family grouping rules for the delta's products, as the main build applies them "
+            f"(default: {DEFAULT_GROUPING_RULES})."
+        ),
+    )
+    parser.add_argument(
+        "--no-grouping-rules",
+        dest="grouping_rules",
+        action="store_const",
+        const=None,
+        help="Leave the delta's products unsplit, as a --no-grouping-rules build writes them.",
+    )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=None,
+        help="Output path for the delta JSON. Defaults to printing it.",
     )
-    args.additional_out.write_text(
-        json.dumps(additional_images, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+    return parser.parse_args(argv)
+
+
+def diff_main(argv: list[str]) -> None:
+    args = parse_diff_args(argv)
+    split_rules = load_grouping_rules(args.grouping_rules) if args.grouping_rules else {}
+    old_rows = read_rows(args.old_xlsx, args.sheet, engine=args.engine, streaming=True)
+    new_rows = read_rows(args.new_xlsx, args.sheet, engine=args.engine, streaming=True)
+    delta = {
+        "format": DELTA_FORMAT,
+        "from": args.old_xlsx.name,
+        "to": args.new_xlsx.name,
+        **diff_catalog(old_rows, new_rows, split_rules),
+    }
+    text = json.dumps(delta, ensure_ascii=False, indent=2)
+    if args.out is None:
+        print(text)
+        return
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(text, encoding="utf-8")
+    print(
+        f"Wrote {args.out} ({len(old_rows)} -> {len(new_rows)} rows: {len(delta['added'])} added, "
+        f"{len(delta['removed'])} removed, {len(delta['changed'])} changed, {len(delta['moved'])} moved; "
+        f"{len(delta['groups'])} groups resequenced, {len(delta['products']['upsert'])} products to upsert, "
+        f"{len(delta['products']['remove'])} to remove)"
+    )
+
+
+def build_catalog(args: argparse.Namespace) -> None:
+    xlsx_path = resolve_xlsx_path(args.xlsx)
+    profile = BuildProfile(args.profile)
+    output_paths = [args.products_out, args.additional_out]
+    output_paths.extend(
+        path
+        for path in (
+            args.compact_out,
+            args.search_index_out,
+            args.facet_index_out,
+            args.code_index_out,
+            args.galleries_out,
+        )
+        if path
     )
 
-    print(f"Wrote {args.products_out} ({len(products)} products)")
+    started_at = time.time()
+    url_cache_ttl_seconds = args.url_cache_ttl * 3600
+
+    def urls_expired(checked_at: float | None) -> bool:
+        # Validated groups are re-checked once their URL answers are older
+        # than the URL cache TTL, even when their rows have not changed.
+        return not args.skip_url_validation and started_at - (checked_at or 0.0) >= url_cache_ttl_seconds
+
+    with profile.stage("check_cache"):
+        workbook_hash = sha256_file(xlsx_path)
+        settings = build_settings(args, xlsx_path)
+        cache = {} if args.force else load_build_cache(args.build_cache, settings)
+        up_to_date = (
+            cache.get("workbook_hash") == workbook_hash
+            and not urls_expired(cache.get("urls_checked_at"))
+            and outputs_match_cache(cache, output_paths)
+        )
+    if up_to_date:
+        print(f"Up to date: {xlsx_path.name} is unchanged since the last build (use --force to rebuild)")
+        if args.profile:
+            profile.counters["up_to_date"] = 1
+            profile.write(args.profile_out, xlsx_path.name)
+        return
+
+    split_rules = load_grouping_rules(args.grouping_rules) if args.grouping_rules else {}
+
+    url_check_options = {
+        "timeout_seconds": args.url_timeout,
+        "workers": args.url_workers,
+        "backend": args.url_backend,
+        "per_host": args.url_per_host,
+        "retries": args.url_retries,
+    }
+    url_cache_path = None if args.no_url_cache else args.url_cache
+
+    pipeline = None
+    if args.pipeline and not args.skip_url_validation:
+        pipeline = UrlValidationPipeline(
+            url_check_options,
+            url_cache_path,
+            url_cache_ttl_seconds,
+            deadline_seconds=args.validation_deadline,
+        )
+    try:
+        with profile.stage("load_workbook"):
+            source_rows = iter_source_rows(
+                xlsx_path,
+                args.sheet,
+                engine=args.engine,
+                streaming=args.streaming,
+                stats=profile.counters,
+            )
+        # The search index is the only output that needs anything per row beyond
+        # its group, so that is all that is kept once a group is built.
+        slugs_by_code: dict[str, str] = {}
+
+        def observe_rows(rows: Iterable[CatalogRow]) -> Iterator[CatalogRow]:
+            for row in rows:
+                if args.search_index_out:
+                    slugs_by_code[row.variant.code] = row.title_en_slug
+                yield row
+
+        if args.stream_groups or pipeline:
+            # Rows are parsed as groups are consumed, so reading the sheet is
+            # timed under build_grouped_products. The pipeline needs groups as
+            # they end so it can queue the URLs of those that are rebuilt.
+            source_groups = iter_ordered_groups(
+                observe_rows(source_rows),
+                lambda: iter_source_rows(xlsx_path, args.sheet, engine=args.engine, streaming=args.streaming),
+                window=args.stream_window,
+                stats=profile.counters,
+            )
+        else:
+            with profile.stage("build_rows"):
+                rows = list(observe_rows(source_rows))
+            source_groups = group_rows_by_key(rows).items()
+
+        # Each group_root bucket becomes exactly one product, so buckets whose rows
+        # hash the same as last time reuse their serialized product and their
+        # already-validated additional images. A group that --stream-groups yields
+        # a second time replaces its first, partial build. Without URL validation
+        # nothing changes a product once it is built, so --stream-groups
+        # serializes each group right away instead of keeping its Product.
+        serialize_early = args.stream_groups and args.skip_url_validation
+        with profile.stage("build_grouped_products"):
+            cached_groups: dict[str, Any] = cache.get("groups", {})
+            groups: dict[str, dict[str, Any]] = {}
+            rebuilt_products: dict[str, Product] = {}
+            rebuilt_keys: set[str] = set()
+            for key, group_rows in source_groups:
+                content_hash = hash_group_rows(group_rows)
+                entry = cached_groups.get(key)
+                if entry is None or entry["hash"] != content_hash or urls_expired(entry.get("urls_checked_at")):
+                    product = build_grouped_products(group_rows)[0]
+                    entry = {
+                        "hash": content_hash,
+                        "urls_checked_at": started_at,
+                        "additional_images": build_additional_images(group_rows),
+                    }
+                    rebuilt_keys.add(key)
+                    if pipeline:
+                        for urls in entry["additional_images"].values():
+                            for url in urls:
+                                pipeline.submit(url)
+                        for url in product_packshot_urls(product):
+                            pipeline.submit(url)
+                    if serialize_early:
+                        serialize_group(entry, product, split_rules)
+                    else:
+                        rebuilt_products[key] = product
+                else:
+                    rebuilt_keys.discard(key)
+                    rebuilt_products.pop(key, None)
+                groups[key] = entry
+
+        pending_images = {
+            code: urls
+            for key in rebuilt_products
+            for code, urls in groups[key]["additional_images"].items()
+        }
+        total_additional_urls = sum(len(urls) for urls in pending_images.values())
+        removed_additional_urls = 0
+        total_packshots = sum(len(product_packshot_urls(product)) for product in rebuilt_products.values())
+        removed_packshots = 0
+        representative_fallbacks = 0
+        url_stats: Counter[str] = Counter()
+        unverified_urls: set[str] = set()
+        # Rebuilt groups with a URL that got no definitive answer this run.
+        unverified_groups: set[str] = set()
+        if not args.skip_url_validation:
+            with profile.stage("url_validation"):
+                # Packshots, representative images (always one of the packshots) and
+                # lifestyle images are checked together, each distinct URL once.
+                if pipeline:
+                    # Rebuilt groups' URLs were queued as each group was built.
+                    reachable_by_url = pipeline.finish()
+                    url_stats = pipeline.stats
+                    unverified_urls = pipeline.unverified
+                else:
+                    all_urls = sorted(
+                        {url for urls in pending_images.values() for url in urls}
+                        | {url for product in rebuilt_products.values() for url in product_packshot_urls(product)}
+                    )
+                    url_cache = None
+                    if url_cache_path:
+                        url_cache = UrlStatusCache(url_cache_path, ttl_seconds=url_cache_ttl_seconds)
+                    try:
+                        reachable_by_url = check_urls(
+                            all_urls,
+                            url_cache=url_cache,
+                            stats=url_stats,
+                            deadline_seconds=args.validation_deadline,
+                            unverified=unverified_urls,
+                            **url_check_options,
+                        )
+                    finally:
+                        if url_cache:
+                            url_cache.close()
+
+                validated_images, total_additional_urls, removed_additional_urls = filter_additional_images(
+                    pending_images,
+                    reachable_by_url,
+                )
+                for key, product in rebuilt_products.items():
+                    entry = groups[key]
+                    group_urls = {url for urls in entry["additional_images"].values() for url in urls}
+                    group_urls.update(product_packshot_urls(product))
+                    if not group_urls.isdisjoint(unverified_urls):
+                        unverified_groups.add(key)
+                    entry["additional_images"] = {
+                        code: validated_images[code]
+                        for code in entry["additional_images"]
+                        if code in validated_images
+                    }
+                    chosen_image = product.representative_image
+                    removed_packshots += drop_unreachable_packshots(product, reachable_by_url)
+                    if product.representative_image != chosen_image:
+                        representative_fallbacks += 1
+    finally:
+        # A failed build must not leave checks (and the URL cache lock) behind.
+        if pipeline:
+            pipeline.close()
+
+    with profile.stage("serialize"):
+        for key, product in rebuilt_products.items():
+            serialize_group(groups[key], product, split_rules)
+
+        ordered_groups = sorted(groups.values(), key=lambda entry: entry["sort_key"])
+        products_text = serialize_products_payload(
+            xlsx_path.name,
+            [fragment for entry in ordered_groups for fragment in entry["products_json"]],
+            family_grouping_applied=args.grouping_rules is not None,
+        )
+        additional_images = dict(
+            sorted(
+                ((code, urls) for entry in groups.values() for code, urls in entry["additional_images"].items()),
+                key=lambda item: item[0],
+            )
+        )
+
+    with profile.stage("write_outputs"):
+        write_text_if_changed(args.products_out, products_text)
+        write_text_if_changed(args.additional_out, json.dumps(additional_images, ensure_ascii=False, indent=2))
+        derived_artifacts = build_derived_artifacts(args, products_text, additional_images, slugs_by_code)
+        for path, data, _ in derived_artifacts.values():
+            write_minified_json(path, data)
+    shard_paths: list[Path] = []
+    if args.shards_out:
+        with profile.stage("shards"):
+            shard_paths = write_catalog_shards(args.shards_out, xlsx_path.name, ordered_groups)
+    listing_paths: list[Path] = []
+    if args.listings_out:
+        with profile.stage("listings"):
+            listing_paths = write_category_listings(
+                args.listings_out,
+                json.loads(products_text)["products"],
+                args.listing_first_page_size,
+                args.listing_page_size,
+            )
+    hashed_paths: list[Path] = []
+    if args.hashed_out:
+        with profile.stage("hashed_outputs"):
+            artifacts = {
+                "products": (args.products_out.stem, products_text),
+                "additional_images": (args.additional_out.stem, args.additional_out.read_text(encoding="utf-8")),
+            }
+            for key, (path, _, _) in derived_artifacts.items():
+                artifacts[key] = (path.stem, path.read_text(encoding="utf-8"))
+            hashed_paths = write_hashed_artifacts(args.hashed_out, artifacts)
+
+    # Groups with unverified URLs are not final: forget their hashes (and the
+    # workbook hash) so the next run rebuilds and validates just those groups.
+    fully_validated = not unverified_groups
+    for key in unverified_groups:
+        groups[key]["hash"] = ""
+
+    with profile.stage("save_build_cache"):
+        save_build_cache(
+            args.build_cache,
+            {
+                "settings": settings,
+                "workbook_hash": workbook_hash if fully_validated else "",
+                "urls_checked_at": min((entry["urls_checked_at"] for entry in groups.values()), default=started_at),
+                "outputs": {str(path): sha256_file(path) for path in [*output_paths, *shard_paths, *listing_paths, *hashed_paths]},
+                "groups": groups,
+            },
+        )
+
+    products_count = sum(len(entry["summaries"]) for entry in groups.values())
+    print(f"Wrote {args.products_out} ({products_count} products, {len(rebuilt_keys)} of {len(groups)} groups rebuilt)")
     print(f"Wrote {args.additional_out} ({len(additional_images)} variant image groups)")
+    for path, _, note in derived_artifacts.values():
+        print(f"Wrote {path} ({note})")
+    if args.listings_out:
+        for line in listing_summary_lines(args.listings_out, listing_paths):
+            print(line)
+    if args.hashed_out:
+        print(f"Wrote {hashed_paths[0]} and {len(hashed_paths) - 1} hashed files")
+    if args.shards_out:
+        print(f"Wrote {args.shards_out / 'manifest.json'} and {len(shard_paths) - 1} product shards")
     if args.skip_url_validation:
-        print("Skipped additional-image URL validation")
+        print("Skipped image URL validation")
     else:
         print(
-            f"Validated additional-image URLs: removed {removed_additional_urls} "
-            f"of {total_additional_urls} links"
+            f"Validated image URLs: removed {removed_additional_urls} of {total_additional_urls} "
+            f"additional-image links and {removed_packshots} of {total_packshots} packshots "
+            f"({representative_fallbacks} representative images fell back)"
+        )
+        print(
+            f"URL checks: {url_stats['probed']} validated ({url_stats['not_modified']} not modified), "
+            f"{url_stats['fresh']} from cache, "
+            f"{url_stats['unverified'] + url_stats['unreached']} unverified "
+            f"({url_stats['unreached']} not reached before the deadline)"
         )
+        if url_stats["throttled"]:
+            print(
+                f"Host throttled {url_stats['throttled']} requests; concurrency ranged "
+                f"{url_stats['concurrency_min']}-{url_stats['concurrency_max']}"
+            )
+
+    if args.profile:
+        profile.counters.update(
+            groups=len(groups),
+            groups_rebuilt=len(rebuilt_keys),
+            products=products_count,
+            urls_probed=url_stats["probed"],
+            urls_not_modified=url_stats["not_modified"],
+            url_cache_hits=url_stats["fresh"],
+            urls_unverified=url_stats["unverified"] + url_stats["unreached"],
+        )
+        profile.write(args.profile_out, xlsx_path.name)
+        print(f"Wrote {args.profile_out} ({len(profile.stages)} stages)")
+
+
+def workbook_snapshot(folder: Path) -> dict[str, tuple[int, int]]:
+    """(mtime, size) of every workbook in ``folder``, skipping Excel's ~$ lock files."""
+    snapshot = {}
+    for path in folder.glob("*.xlsx"):
+        if path.name.startswith("~$"):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            # Removed between glob and stat, e.g. while Excel swaps files.
+            continue
+        snapshot[path.name] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def watch_workbooks(args: argparse.Namespace) -> None:
+    """Build, then rebuild whenever a workbook changes, until interrupted.
+
+    The folder is polled rather than subscribed to, so this needs nothing
+    beyond the standard library. Excel saves through temporary files and
+    renames, so a change only triggers a build once the folder has stayed
+    the same for ``--watch-debounce`` seconds. Each build goes through the
+    build cache, so only changed groups are rebuilt and revalidated.
+    """
+    folder = args.xlsx.parent if args.xlsx else Path("src/data")
+    build_catalog(args)
+    snapshot = workbook_snapshot(folder)
+    print(f"Watching {folder}/*.xlsx (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.watch_interval)
+            current = workbook_snapshot(folder)
+            if current == snapshot:
+                continue
+            while True:
+                time.sleep(args.watch_debounce)
+                settled = workbook_snapshot(folder)
+                if settled == current:
+                    break
+                current = settled
+            changed = sorted(
+                name for name in current.keys() | snapshot.keys() if current.get(name) != snapshot.get(name)
+            )
+            snapshot = current
+            print(f"[{time.strftime('%H:%M:%S')}] Changed: {', '.join(changed)}")
+            # A half-written or broken workbook must not end the watch.
+            try:
+                build_catalog(args)
+            except Exception as error:
+                print(f"Build failed: {type(error).__name__}: {error}")
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+
+def main() -> None:
+    if sys.argv[1:2] == ["diff"]:
+        diff_main(sys.argv[2:])
+        return
+
+    args = parse_args()
+    if args.watch:
+        watch_workbooks(args)
+    else:
+        build_catalog(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,52 @@
+"""
+The compact catalog format decodes back to the exact payload, whatever the
+image columns hold.
+
+Run with ``python -m pytest src/data``.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from catalog_compact import IMAGE_PREFIX, decode_catalog, encode_catalog
+
+
+def payload_with_images(*image_urls: str) -> dict[str, Any]:
+    variants = [
+        {"code": f"{index}", "description": "", "color": "", "image_url": url, "pack": "", "excel_ar": ""}
+        for index, url in enumerate(image_urls)
+    ]
+    specs = {"liters": "", "width": "", "depth": "", "box_height": "", "diameter": "", "height": "", "has_specs": False}
+    product = {
+        "id": "1",
+        "family_indicator": "",
+        "group_root": "1",
+        "title": "Γλάστρα",
+        "category": "",
+        "representative_image": image_urls[0],
+        "sizes": [{"size_label": "", "size_code": "1", "variants": variants, "colors_count": 1, "specs": specs}],
+        "sizes_count": 1,
+        "variants_count": len(variants),
+    }
+    return {"source_file": "SITE.xlsx", "products_count": 1, "products": [product]}
+
+
+def test_image_values_round_trip() -> None:
+    payload = payload_with_images(
+        "`",
+        f"{IMAGE_PREFIX}a.jpg",
+        "https://cdn.example.com/a.jpg",
+        "",
+        "a.jpg",
+    )
+    compact = encode_catalog(payload)
+    # Survives the trip through JSON, as written by --compact-out.
+    assert decode_catalog(json.loads(json.dumps(compact))) == payload
+
+
+def test_image_prefix_is_dropped() -> None:
+    compact = encode_catalog(payload_with_images(f"{IMAGE_PREFIX}a.jpg"))
+    assert "a.jpg" in compact["strings"]
+    assert f"{IMAGE_PREFIX}a.jpg" not in compact["strings"]
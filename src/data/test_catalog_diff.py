@@ -0,0 +1,77 @@
+"""
+Applying a catalog delta to the previous products-grouped.json gives the
+payload the generator builds from the new workbook, in the same order.
+
+Run with ``python -m pytest src/data``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any
+
+from catalog_diff import apply_catalog_delta
+from catalog_records import CatalogRow, Variant
+from generate_catalog_json import (
+    build_additional_images,
+    build_grouped_products,
+    diff_catalog,
+    product_sort_key,
+    split_grouped_product,
+)
+
+
+def row(group_root: str, group_code: str, title: str, code: str) -> CatalogRow:
+    return CatalogRow(
+        group_root=group_root,
+        family_indicator="",
+        group_code=group_code,
+        title=title,
+        title_en_slug="",
+        category="",
+        size_code=code.split("-")[0],
+        variant=Variant(code=code, description="", color="", image_url="", pack="", excel_ar=""),
+        additional_images=[],
+    )
+
+
+def payload(rows: list[CatalogRow], split_rules: dict[str, list[dict[str, Any]]]) -> dict[str, Any]:
+    products = sorted(build_grouped_products(rows), key=product_sort_key)
+    items = [item.to_json() for product in products for item in split_grouped_product(product, split_rules)]
+    data: dict[str, Any] = {"source_file": "SITE.xlsx", "products_count": len(items)}
+    if split_rules:
+        data["family_grouping_applied"] = True
+    data["products"] = items
+    return data
+
+
+def check_patch(old_rows: list[CatalogRow], new_rows: list[CatalogRow], split_rules: dict[str, Any]) -> None:
+    delta = diff_catalog(old_rows, new_rows, split_rules)
+    delta["to"] = "SITE.xlsx"
+    patched, _ = apply_catalog_delta(payload(old_rows, split_rules), build_additional_images(old_rows), delta)
+    assert patched == payload(new_rows, split_rules)
+
+
+def test_groups_without_a_group_root_are_ordered_by_title_and_id() -> None:
+    # Without a W marker each group is keyed by its code and has an empty
+    # group_root, so only title and id order them.
+    old_rows = [
+        row("", "300", "Β", "300-1"),
+        row("", "100", "Δ", "100-1"),
+        row("1090", "1090", "Α", "1090-1"),
+    ]
+    new_rows = [*old_rows, row("", "200", "Γ", "200-1"), row("", "050", "Β", "050-1")]
+    new_rows[1] = replace(new_rows[1], title="Α")
+    check_patch(old_rows, new_rows, {})
+
+
+def test_split_groups_keep_rule_order() -> None:
+    rules = {
+        "1090": [
+            {"groupName": "1090-B", "title": "Ω", "sizeCodes": ["20"]},
+            {"groupName": "1090-A", "title": "Α", "sizeCodes": ["10"]},
+        ]
+    }
+    old_rows = [row("1090", "1090", "Μ", "10-1"), row("1090", "1090", "Μ", "20-1"), row("1100", "1100", "Β", "30-1")]
+    new_rows = [row("1080", "1080", "Ψ", "40-1"), *old_rows, row("1090", "1090", "Μ", "20-2")]
+    check_patch(old_rows, new_rows, rules)
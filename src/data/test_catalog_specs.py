@@ -0,0 +1,33 @@
+"""
+Spec parsing gives the expected specs for every description in the golden
+corpus (``specs-golden.json``).
+
+Run with ``python -m pytest src/data``.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from catalog_specs import SPEC_FIELDS, parse_specs_from_text
+
+SPECS_GOLDEN = Path(__file__).resolve().parent / "specs-golden.json"
+
+
+def test_specs_match_golden_corpus() -> None:
+    golden = json.loads(SPECS_GOLDEN.read_text(encoding="utf-8"))
+    mismatches = {
+        description: parse_specs_from_text(description)
+        for description, expected in golden.items()
+        if parse_specs_from_text(description) != {**dict(zip(SPEC_FIELDS, expected)), "has_specs": any(expected)}
+    }
+    assert golden
+    assert mismatches == {}
+
+
+def test_memoized_specs_are_fresh_dicts() -> None:
+    description = "ΚΑΣΠΩ LINEA 7lt-d25x21h cm-ΜΟΛΥΒΙ"
+    first = parse_specs_from_text(description)
+    first["liters"] = "changed"
+    assert parse_specs_from_text(description)["liters"] == "7"
@@ -0,0 +1,106 @@
+"""
+The URL status cache skips fresh entries, revalidates stale ones and only
+stores definitive answers.
+
+Run with ``python -m pytest src/data``.
+"""
+
+from __future__ import annotations
+
+import socket
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from bench_catalog_json import stand_in_server
+from catalog_url_cache import UrlStatusCache
+from generate_catalog_json import check_urls
+
+TTL_SECONDS = 3600.0
+
+
+@pytest.fixture
+def server():
+    with stand_in_server() as server:
+        yield server
+
+
+@pytest.fixture
+def url_cache(tmp_path: Path):
+    cache = UrlStatusCache(tmp_path / "url-status.sqlite3", ttl_seconds=TTL_SECONDS)
+    yield cache
+    cache.close()
+
+
+def base_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def check(urls: list[str], url_cache: UrlStatusCache, stats: Counter[str]) -> dict[str, bool]:
+    return check_urls(urls, timeout_seconds=5.0, workers=4, url_cache=url_cache, retries=0, stats=stats)
+
+
+def closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/images/a.jpg"
+
+
+def test_fresh_entry_makes_no_request(server, url_cache: UrlStatusCache) -> None:
+    url = f"{base_url(server)}/images/a.jpg"
+    url_cache.put(url, {"status": 200, "reachable": True, "etag": '"a"', "last_modified": ""})
+    stats: Counter[str] = Counter()
+
+    assert check([url], url_cache, stats) == {url: True}
+    assert server.requests == 0
+    assert stats["fresh"] == 1
+
+
+def test_expired_entry_is_revalidated_with_a_conditional_request(server, url_cache: UrlStatusCache) -> None:
+    url = f"{base_url(server)}/images/a.jpg"
+    check([url], url_cache, Counter())
+    etag = url_cache.get(url)["etag"]
+    assert etag
+    expired_at = time.time() - 2 * TTL_SECONDS
+    url_cache.put(url, {"status": 200, "reachable": True, "etag": etag, "last_modified": ""}, checked_at=expired_at)
+    stats: Counter[str] = Counter()
+
+    assert check([url], url_cache, stats) == {url: True}
+    assert server.not_modified == 1
+    assert stats["not_modified"] == 1
+    entry = url_cache.get(url)
+    assert entry["status"] == 304
+    assert entry["etag"] == etag
+    assert url_cache.is_fresh(entry)
+
+
+def test_failures_without_an_answer_are_not_stored(server, url_cache: UrlStatusCache) -> None:
+    urls = [f"{base_url(server)}/status/{status}" for status in (429, 500, 503)] + [closed_port_url()]
+    stats: Counter[str] = Counter()
+
+    # Never checked before, so they are kept rather than dropped.
+    assert check(urls, url_cache, stats) == {url: True for url in urls}
+    assert stats["unverified"] == len(urls)
+    for url in urls:
+        assert url_cache.get(url) is None
+
+    url_cache.put(urls[0], {"status": None, "reachable": False, "etag": "", "last_modified": ""})
+    assert url_cache.get(urls[0]) is None
+
+
+def test_404_is_stored_as_unreachable(server, url_cache: UrlStatusCache) -> None:
+    url = f"{base_url(server)}/missing/a.jpg"
+    stats: Counter[str] = Counter()
+
+    assert check([url], url_cache, stats) == {url: False}
+    entry = url_cache.get(url)
+    assert entry["status"] == 404
+    assert entry["reachable"] is False
+
+    # A cached 404 is answered from the cache while fresh.
+    requests = server.requests
+    assert check([url], url_cache, Counter()) == {url: False}
+    assert server.requests == requests
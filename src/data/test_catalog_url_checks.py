@@ -0,0 +1,104 @@
+"""
+The threads and asyncio URL backends agree on awkward workbook values.
+
+Run with ``python -m pytest src/data``.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from bench_catalog_json import stand_in_server
+from catalog_url_async import request_url
+from catalog_url_cache import UrlStatusCache
+from generate_catalog_json import URL_BACKENDS, UrlValidationPipeline, check_urls
+
+
+@pytest.fixture
+def base_url():
+    with stand_in_server() as server:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def awkward_urls(base_url: str) -> dict[str, bool]:
+    """Workbook-style values -> whether the image should be kept."""
+    return {
+        "`": False,
+        "not a url": False,
+        "ftp://viomes.gr/images/a.jpg": False,
+        "http://[::1/images/a.jpg": False,
+        "http://viomes.gr:port/images/a.jpg": False,
+        "https:///images/a.jpg": False,
+        f"{base_url}/images/plain.jpg": True,
+        f"{base_url}/images/with space.jpg": True,
+        f"{base_url}/images/already%20escaped.jpg": True,
+        f"{base_url}/images/γλάστρα.jpg": True,
+        f"{base_url}/missing/with space.jpg": False,
+        f"{base_url}/missing/γλάστρα.jpg": False,
+    }
+
+
+def test_request_url_encodes_path_and_rejects_unusable_values() -> None:
+    assert request_url("https://viomes.gr/images/a b.jpg") == "https://viomes.gr/images/a%20b.jpg"
+    assert request_url("https://viomes.gr/images/a%20b.jpg") == "https://viomes.gr/images/a%20b.jpg"
+    assert request_url("https://viomes.gr/γ.jpg") == "https://viomes.gr/%CE%B3.jpg"
+    for value in ("`", "", "ftp://viomes.gr/a.jpg", "http://[::1/a.jpg", "http://viomes.gr:port/a.jpg"):
+        assert request_url(value) is None
+
+
+@pytest.mark.parametrize("backend", URL_BACKENDS)
+def test_backend_verdicts(base_url: str, backend: str) -> None:
+    expected = awkward_urls(base_url)
+    reachable_by_url = check_urls(
+        list(expected),
+        timeout_seconds=5.0,
+        workers=4,
+        backend=backend,
+        per_host=4,
+        retries=0,
+    )
+    assert reachable_by_url == expected
+
+
+def test_backends_agree(base_url: str) -> None:
+    urls = list(awkward_urls(base_url))
+    verdicts = [
+        check_urls(urls, timeout_seconds=5.0, workers=4, backend=backend, per_host=4, retries=0)
+        for backend in URL_BACKENDS
+    ]
+    assert verdicts[0] == verdicts[1]
+
+
+@pytest.mark.parametrize("backend", URL_BACKENDS)
+def test_pipeline_matches_check_urls(base_url: str, backend: str) -> None:
+    expected = awkward_urls(base_url)
+    options = {"timeout_seconds": 5.0, "workers": 4, "backend": backend, "per_host": 4, "retries": 0}
+    pipeline = UrlValidationPipeline(options, None, 0.0)
+    for url in expected:
+        pipeline.submit(url)
+    assert pipeline.finish() == expected
+    assert pipeline.stats["probed"] == len(expected)
+    assert not pipeline.unverified
+
+
+@pytest.mark.parametrize("backend", URL_BACKENDS)
+def test_closed_pipeline_releases_the_url_cache(tmp_path: Path, backend: str) -> None:
+    cache_path = tmp_path / "url-status.sqlite3"
+    options = {"timeout_seconds": 5.0, "workers": 2, "backend": backend, "per_host": 2, "retries": 0}
+    with stand_in_server(latency=0.5) as server:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        pipeline = UrlValidationPipeline(options, cache_path, 3600.0)
+        for index in range(20):
+            pipeline.submit(f"{base_url}/images/{index}.jpg")
+        # As build_catalog does when the build fails before finish().
+        started = time.monotonic()
+        pipeline.close()
+        assert time.monotonic() - started < 3.0
+        assert not pipeline.thread.is_alive()
+
+    url_cache = UrlStatusCache(cache_path, ttl_seconds=3600.0)
+    url_cache.put(f"{base_url}/images/new.jpg", {"status": 200, "reachable": True})
+    url_cache.close()
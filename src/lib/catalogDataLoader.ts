@@ -6,6 +6,8 @@ import {
 
 type CatalogProductsResponse = {
   products: GroupedProduct[];
+  // Set when generate_catalog_json.py --grouping-rules already split the products.
+  family_grouping_applied?: boolean;
 };
 
 type AdditionalImagesResponse = Record<string, string[]>;
@@ -39,6 +41,8 @@ const buildProductSplitRules = (): Record<string, ProductSplitRule[]> => {
   return rules;
 };
 
+let productSplitRules: Record<string, ProductSplitRule[]> | null = null;
+
 const withBaseUrl = (relativePath: string) => {
   const base = import.meta.env.BASE_URL || "/";
   const normalizedBase = base.endsWith("/") ? base : `${base}/`;
@@ -70,7 +74,7 @@ const fetchWithFallbacks = async <T>(paths: string[]): Promise<T> => {
 };
 
 const splitGroupedProduct = (product: GroupedProduct): GroupedProduct[] => {
-  const productSplitRules = buildProductSplitRules();
+  if (!productSplitRules) productSplitRules = buildProductSplitRules();
   const rules = productSplitRules[product.id];
   if (!rules || rules.length === 0) return [product];
 
@@ -117,8 +121,10 @@ const splitGroupedProduct = (product: GroupedProduct): GroupedProduct[] => {
   return splitProducts;
 };
 
-const normalizeGroupedProducts = (products: GroupedProduct[]) =>
-  products.flatMap((product) => splitGroupedProduct(product));
+const normalizeGroupedProducts = (payload: Partial<CatalogProductsResponse>) =>
+  payload.family_grouping_applied
+    ? (payload.products ?? [])
+    : (payload.products ?? []).flatMap((product) => splitGroupedProduct(product));
 
 export const loadCatalogProducts = async (): Promise<GroupedProduct[]> => {
   if (!catalogProductsPromise) {
@@ -126,12 +132,13 @@ export const loadCatalogProducts = async (): Promise<GroupedProduct[]> => {
       withBaseUrl("data/products-grouped.json"),
       "/data/products-grouped.json",
     ])
-      .then((payload) => normalizeGroupedProducts(payload.products ?? []))
+      .then((payload) => normalizeGroupedProducts(payload))
       .catch(async () => {
         const module = await import("@/data/products-grouped.json");
-        const fallbackProducts =
-          (module.default?.products as GroupedProduct[] | undefined) ?? [];
-        return normalizeGroupedProducts(fallbackProducts);
+        const fallbackPayload = module.default as unknown as
+          | Partial<CatalogProductsResponse>
+          | undefined;
+        return normalizeGroupedProducts(fallbackPayload ?? {});
       });
   }
 